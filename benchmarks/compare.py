@@ -0,0 +1,80 @@
+"""Compare two benchmark reports written by ``benchmarks/run.py --output``.
+
+    python benchmarks/compare.py baseline.json candidate.json
+                                 [--threshold 0.10] [--min-delta-ms 1]
+
+Prints the change in each metric's median. Exits with 1 when any metric got
+slower by more than ``--threshold`` (a fraction of the baseline) and by more
+than ``--min-delta-ms``, so sub-millisecond jitter on tiny metrics doesn't
+count as a regression. Metrics present in only one report are listed but
+never fail the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def compare(
+    baseline: dict, candidate: dict, threshold: float, min_delta_ms: float
+) -> list[dict]:
+    """One row per metric in either report, with ``regressed`` set."""
+    before = baseline.get("metrics", {})
+    after = candidate.get("metrics", {})
+    rows = []
+    for name in sorted(before.keys() | after.keys()):
+        old = before.get(name, {}).get("median")
+        new = after.get(name, {}).get("median")
+        row = {"metric": name, "baseline": old, "candidate": new, "change": None}
+        if old is not None and new is not None:
+            delta = new - old
+            row["change"] = delta / old if old else None
+            row["regressed"] = delta > min_delta_ms and delta > old * threshold
+        else:
+            row["regressed"] = False
+        rows.append(row)
+    return rows
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}ms"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true", help="Print JSON rows")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    candidate = json.loads(Path(args.candidate).read_text())
+    rows = compare(baseline, candidate, args.threshold, args.min_delta_ms)
+    regressions = [row for row in rows if row["regressed"]]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(
+            f"baseline {baseline.get('commit') or '?'} -> "
+            f"candidate {candidate.get('commit') or '?'} (medians)"
+        )
+        width = max((len(row["metric"]) for row in rows), default=0)
+        for row in rows:
+            change = row["change"]
+            change_text = "" if change is None else f"{change:+.1%}"
+            flag = "  REGRESSION" if row["regressed"] else ""
+            print(
+                f"{row['metric']:<{width}}  {_fmt(row['baseline']):>10}  "
+                f"{_fmt(row['candidate']):>10}  {change_text:>8}{flag}"
+            )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
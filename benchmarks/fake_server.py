@@ -0,0 +1,385 @@
+"""Local stand-in for the Anthropic Messages API, for offline benchmarks.
+
+Speaks enough of the streaming protocol (``message_start`` ...
+``message_stop`` server-sent events) for the SDK's ``messages.stream``, with
+a configurable time to first token, token rate, chunk size and response
+shape. Responses are deterministic filler text wrapped the way the app
+expects:
+
+- ``question``: a clarifying question
+- ``enhanced_prompt``: a prompt inside ``<enhanced_prompt>`` tags
+- ``suggestions``: three ``<suggestion>`` blocks
+- ``auto``: ``suggestions`` for wizard requests, otherwise ``question``
+  until ``questions`` replies have been given, then ``enhanced_prompt``
+
+It also serves the Message Batches endpoints (create, retrieve and the
+JSONL results) for ``prompt-enhancer batch --backend message-batches``. A
+batch reports ``in_progress`` until ``ttft_s`` after it was created, then
+``ended`` with every request succeeded.
+
+Use it from code (``with FakeAnthropicServer(profile) as server``, then
+point ``base_url`` at ``server.base_url``) or run it standalone and set
+``"base_url"`` in ``config.json``:
+
+    python benchmarks/fake_server.py --port 8765 --ttft-ms 300 --tokens-per-second 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import itertools
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SHAPES = ("auto", "question", "enhanced_prompt", "suggestions")
+
+_WORDS = (
+    "context audience constraints format examples tone detail goal "
+    "steps output review edge cases success criteria scope length"
+).split()
+
+
+@dataclass
+class ServerProfile:
+    """How the fake server paces and shapes its responses.
+
+    A "token" is one word of filler text; ``tokens_per_second`` of 0 sends
+    the whole response as fast as the socket allows.
+    """
+
+    ttft_s: float = 0.3
+    tokens_per_second: float = 80.0
+    chunk_tokens: int = 3
+    response_tokens: int = 120
+    shape: str = "auto"
+    questions: int = 2
+
+
+def _filler(count: int) -> str:
+    return " ".join(itertools.islice(itertools.cycle(_WORDS), max(1, count)))
+
+
+def _pick_shape(profile: ServerProfile, body: dict) -> str:
+    if profile.shape != "auto":
+        return profile.shape
+    system = body.get("system", "")
+    if not isinstance(system, str):
+        system = " ".join(block.get("text", "") for block in system)
+    if "<suggestion>" in system:
+        return "suggestions"
+    replies = sum(1 for m in body.get("messages", []) if m.get("role") == "assistant")
+    return "enhanced_prompt" if replies >= profile.questions else "question"
+
+
+def render_response(profile: ServerProfile, body: dict) -> str:
+    """The full response text the server streams for request ``body``."""
+    shape = _pick_shape(profile, body)
+    n = profile.response_tokens
+    if shape == "suggestions":
+        per = max(1, n // 3)
+        return "\n".join(
+            f"<suggestion>\n{_filler(per)}\n</suggestion>" for _ in range(3)
+        )
+    if shape == "enhanced_prompt":
+        return (
+            "Here is your enhanced prompt:\n<enhanced_prompt>\n"
+            f"{_filler(n)}\n</enhanced_prompt>\nWould you like any changes?"
+        )
+    return f"Thanks. To tailor this, could you tell me about the {_filler(n)}?"
+
+
+def _chunks(text: str, chunk_tokens: int) -> list[str]:
+    words = text.split(" ")
+    step = max(1, chunk_tokens)
+    out = []
+    for i in range(0, len(words), step):
+        piece = " ".join(words[i : i + step])
+        out.append(piece if i + step >= len(words) else piece + " ")
+    return out
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("content-length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests += 1
+        if self.path.split("?")[0] == "/v1/messages/batches":
+            self._create_batch(body)
+            return
+        if not self.path.startswith("/v1/messages"):
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+            return
+        profile = self.server.profile
+        text = render_response(profile, body)
+        chunks = _chunks(text, profile.chunk_tokens)
+        usage = {"input_tokens": len(json.dumps(body)) // 4, "output_tokens": len(text.split())}
+        if not body.get("stream"):
+            time.sleep(profile.ttft_s)
+            self._send_json(200, self._message(body, [{"type": "text", "text": text}], usage))
+            return
+        try:
+            self._stream(body, chunks, usage, profile)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client cancelled the request
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        parts = self.path.split("?")[0].strip("/").split("/")
+        # v1 / messages / batches / <id> [/ results]
+        batch = None
+        if len(parts) in (4, 5) and parts[:3] == ["v1", "messages", "batches"]:
+            batch = self.server.batches.get(parts[3])
+        if batch is None or (len(parts) == 5 and parts[4] != "results"):
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+        elif len(parts) == 5:
+            self._send_results(batch)
+        else:
+            self._send_json(200, self._batch(batch))
+
+    def _create_batch(self, body: dict) -> None:
+        with self.server.lock:
+            batch_id = f"msgbatch_fake_{len(self.server.batches)}"
+            batch = {
+                "id": batch_id,
+                "requests": body.get("requests", []),
+                "created_at": time.time(),
+            }
+            self.server.batches[batch_id] = batch
+        self._send_json(200, self._batch(batch))
+
+    def _batch(self, batch: dict) -> dict:
+        ended = time.time() - batch["created_at"] >= self.server.profile.ttft_s
+        count = len(batch["requests"])
+        host, port = self.server.server_address[:2]
+
+        def stamp(seconds: float) -> str:
+            moment = datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+            return moment.isoformat().replace("+00:00", "Z")
+
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": stamp(batch["created_at"]),
+            "expires_at": stamp(batch["created_at"] + 86400),
+            "ended_at": stamp(time.time()) if ended else None,
+            "cancel_initiated_at": None,
+            "archived_at": None,
+            "results_url": (
+                f"http://{host}:{port}/v1/messages/batches/{batch['id']}/results"
+                if ended
+                else None
+            ),
+        }
+
+    def _send_results(self, batch: dict) -> None:
+        lines = []
+        for request in batch["requests"]:
+            params = request.get("params", {})
+            text = render_response(self.server.profile, params)
+            usage = {
+                "input_tokens": len(json.dumps(params)) // 4,
+                "output_tokens": len(text.split()),
+            }
+            message = self._message(params, [{"type": "text", "text": text}], usage)
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": request.get("custom_id"),
+                        "result": {"type": "succeeded", "message": message},
+                    }
+                )
+            )
+        data = ("\n".join(lines) + "\n").encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/binary")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _message(self, body: dict, content: list, usage: dict) -> dict:
+        return {
+            "id": f"msg_fake_{self.server.requests}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": content,
+            "stop_reason": "end_turn" if content else None,
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _event(self, name: str, data: dict) -> None:
+        payload = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+        self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(
+        self, body: dict, chunks: list[str], usage: dict, profile: ServerProfile
+    ) -> None:
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("transfer-encoding", "chunked")
+        self.end_headers()
+        time.sleep(profile.ttft_s)
+        self._event(
+            "message_start",
+            {
+                "type": "message_start",
+                "message": self._message(
+                    body, [], {"input_tokens": usage["input_tokens"], "output_tokens": 1}
+                ),
+            },
+        )
+        self._event(
+            "content_block_start",
+            {"type": "content_block_start", "index": 0,
+             "content_block": {"type": "text", "text": ""}},
+        )
+        delay = (
+            profile.chunk_tokens / profile.tokens_per_second
+            if profile.tokens_per_second > 0
+            else 0
+        )
+        for i, chunk in enumerate(chunks):
+            if i and delay:
+                time.sleep(delay)
+            self._event(
+                "content_block_delta",
+                {"type": "content_block_delta", "index": 0,
+                 "delta": {"type": "text_delta", "text": chunk}},
+            )
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event(
+            "message_delta",
+            {"type": "message_delta",
+             "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+             "usage": {"output_tokens": usage["output_tokens"]}},
+        )
+        self._event("message_stop", {"type": "message_stop"})
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    profile: ServerProfile
+    requests: int = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.batches: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+
+class FakeAnthropicServer:
+    """The fake API on a background thread; ``profile`` can be swapped live."""
+
+    def __init__(
+        self, profile: ServerProfile | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self._server = _Server((host, port), _Handler)
+        self._server.profile = profile or ServerProfile()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def profile(self) -> ServerProfile:
+        return self._server.profile
+
+    @profile.setter
+    def profile(self, profile: ServerProfile) -> None:
+        self._server.profile = profile
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    def start(self) -> FakeAnthropicServer:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-anthropic", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> FakeAnthropicServer:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    defaults = ServerProfile()
+    parser.add_argument("--ttft-ms", type=float, default=defaults.ttft_s * 1000)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--chunk-tokens", type=int, default=defaults.chunk_tokens)
+    parser.add_argument("--response-tokens", type=int, default=defaults.response_tokens)
+    parser.add_argument("--shape", choices=SHAPES, default=defaults.shape)
+    parser.add_argument("--questions", type=int, default=defaults.questions)
+    args = parser.parse_args(argv)
+
+    profile = ServerProfile(
+        ttft_s=args.ttft_ms / 1000,
+        tokens_per_second=args.tokens_per_second,
+        chunk_tokens=args.chunk_tokens,
+        response_tokens=args.response_tokens,
+        shape=args.shape,
+        questions=args.questions,
+    )
+    server = FakeAnthropicServer(profile, args.host, args.port)
+    print(f"Fake Anthropic API on {server.base_url}")
+    for field in fields(profile):
+        print(f"  {field.name}: {getattr(profile, field.name)}")
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
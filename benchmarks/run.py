@@ -0,0 +1,271 @@
+"""Offline benchmark suite against the fake streaming server.
+
+Run from the repository root:
+
+    python benchmarks/run.py [--runs 5] [--only session,templates]
+                             [--output report.json]
+
+Scenarios:
+
+- ``session``: a three-turn ``EnhancementSession`` conversation (two
+  questions, then the enhanced prompt); time to first chunk and turn time
+- ``suggestions``: ``wizard_api.generate_suggestions`` with the cache off
+- ``screen``: one ``SessionScreen`` turn driven through Textual's pilot, from
+  pressing Enter until the enhanced prompt is on screen
+- ``templates``: ``list_templates`` over 10, 1k and 10k JSON templates, cold
+  (first call on a fresh repository) and warm (nothing changed on disk)
+
+Everything runs against ``fake_server.py`` with a throwaway HOME, so no
+network, API key or user data is involved. The JSON report (``--output``)
+holds median/p95/min/max per metric in milliseconds plus the commit and the
+server profile; compare two reports with ``benchmarks/compare.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+
+from fake_server import FakeAnthropicServer, ServerProfile
+
+ROOT = Path(__file__).resolve().parent.parent
+SCENARIOS = ("session", "suggestions", "screen", "templates")
+TEMPLATE_COUNTS = (10, 1_000, 10_000)
+
+
+def _stats(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median": statistics.median(ordered),
+        "p95": ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)],
+        "min": ordered[0],
+        "max": ordered[-1],
+        "runs": len(ordered),
+    }
+
+
+def _ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def _config(server: FakeAnthropicServer):
+    from prompt_enhancer.config import load_config
+
+    return replace(
+        load_config(),
+        base_url=server.base_url,
+        suggestion_cache=False,
+        response_cache=False,
+        metrics_log=False,
+        wizard_prefetch=False,
+    )
+
+
+async def warm_up(server: FakeAnthropicServer) -> None:
+    """One untimed turn, so SDK import and connection setup aren't measured."""
+    from prompt_enhancer.api import EnhancementSession
+    from prompt_enhancer.builtin_templates import BUILTIN_TEMPLATES
+
+    session = EnhancementSession(BUILTIN_TEMPLATES[0], _config(server))
+    async for _ in session.send_message("warm up"):
+        pass
+
+
+async def bench_session(server: FakeAnthropicServer, runs: int) -> dict:
+    from prompt_enhancer.api import EnhancementSession
+    from prompt_enhancer.builtin_templates import BUILTIN_TEMPLATES
+
+    config = _config(server)
+    first_chunk: list[float] = []
+    turns: list[float] = []
+    for _ in range(runs):
+        session = EnhancementSession(BUILTIN_TEMPLATES[0], config)
+        for message in ("a prompt for code review", "python", "security"):
+            start = time.perf_counter()
+            seen_first = False
+            async for _ in session.send_message(message):
+                if not seen_first:
+                    first_chunk.append(_ms(start))
+                    seen_first = True
+            turns.append(_ms(start))
+        assert session.extract_enhanced_prompt(), "no enhanced prompt produced"
+    return {"session.first_chunk": first_chunk, "session.turn": turns}
+
+
+async def bench_suggestions(server: FakeAnthropicServer, runs: int) -> dict:
+    from prompt_enhancer.wizard_api import generate_suggestions
+
+    config = _config(server)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        suggestions = await generate_suggestions(
+            config, "Benchmark", "system_prompt", {}
+        )
+        samples.append(_ms(start))
+        assert len(suggestions) == 3, suggestions
+    return {"suggestions.total": samples}
+
+
+async def bench_screen(server: FakeAnthropicServer, runs: int) -> dict:
+    from prompt_enhancer.app import PromptEnhancerApp
+    from prompt_enhancer.builtin_templates import BUILTIN_TEMPLATES
+    from prompt_enhancer.screens.session import SessionScreen
+    from textual.widgets import Input
+
+    config = _config(server)
+    server.profile = replace(server.profile, shape="enhanced_prompt")
+    samples = []
+    try:
+        app = PromptEnhancerApp()
+        async with app.run_test(size=(120, 40)) as pilot:
+            # The first screen also pays for stylesheet and widget setup.
+            for i in range(runs + 1):
+                screen = SessionScreen(BUILTIN_TEMPLATES[0], config)
+                app.push_screen(screen)
+                await pilot.pause()
+                await pilot.press(*"a prompt for code review")
+                # Submit directly: pilot.press would also wait for idle.
+                start = time.perf_counter()
+                await screen.query_one("#session-input", Input).action_submit()
+                while screen._streaming or screen._enhanced_prompt is None:
+                    await asyncio.sleep(0.001)
+                if i:
+                    samples.append(_ms(start))
+                app.pop_screen()
+                await pilot.pause()
+    finally:
+        server.profile = replace(server.profile, shape="auto")
+    return {"screen.turn": samples}
+
+
+def bench_templates(runs: int) -> dict:
+    from prompt_enhancer.models import Template
+    from prompt_enhancer.templates import TemplateRepository
+
+    results: dict[str, list[float]] = {}
+    for count in TEMPLATE_COUNTS:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory)
+            for i in range(count):
+                template = Template(
+                    name=f"Template {i:05d}",
+                    system_prompt=f"You are assistant number {i}.",
+                    id=f"bench-{i:05d}",
+                )
+                (path / f"{template.id}.json").write_text(template.to_json())
+            cold, warm = [], []
+            for _ in range(runs):
+                repository = TemplateRepository(path)
+                start = time.perf_counter()
+                listed = repository.list_templates()
+                cold.append(_ms(start))
+                start = time.perf_counter()
+                repository.list_templates()
+                warm.append(_ms(start))
+                assert len(listed) >= count
+        results[f"templates.{count}.cold"] = cold
+        results[f"templates.{count}.warm"] = warm
+    return results
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+async def run_suite(only: list[str], runs: int, profile: ServerProfile) -> dict:
+    metrics: dict[str, list[float]] = {}
+    with FakeAnthropicServer(profile) as server:
+        if {"session", "suggestions", "screen"} & set(only):
+            await warm_up(server)
+        if "session" in only:
+            metrics.update(await bench_session(server, runs))
+        if "suggestions" in only:
+            metrics.update(await bench_suggestions(server, runs))
+        if "screen" in only:
+            metrics.update(await bench_screen(server, runs))
+    if "templates" in only:
+        metrics.update(bench_templates(runs))
+    return {name: _stats(samples) for name, samples in metrics.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--only",
+        default=",".join(SCENARIOS),
+        help=f"Comma-separated scenarios (default: {','.join(SCENARIOS)})",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    defaults = ServerProfile(ttft_s=0.05, tokens_per_second=2000.0)
+    parser.add_argument("--ttft-ms", type=float, default=defaults.ttft_s * 1000)
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=defaults.tokens_per_second
+    )
+    parser.add_argument("--chunk-tokens", type=int, default=defaults.chunk_tokens)
+    parser.add_argument(
+        "--response-tokens", type=int, default=defaults.response_tokens
+    )
+    args = parser.parse_args(argv)
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = sorted(set(only) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    profile = replace(
+        defaults,
+        ttft_s=args.ttft_ms / 1000,
+        tokens_per_second=args.tokens_per_second,
+        chunk_tokens=args.chunk_tokens,
+        response_tokens=args.response_tokens,
+    )
+
+    with tempfile.TemporaryDirectory() as home:
+        # Paths under ~/.prompt_enhancer are resolved at import time.
+        os.environ["HOME"] = home
+        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-benchmark"
+        sys.path.insert(0, str(ROOT / "src"))
+        results = asyncio.run(run_suite(only, args.runs, profile))
+
+    report = {
+        "commit": _commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "server_profile": asdict(profile),
+        "unit": "ms",
+        "metrics": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    width = max(len(name) for name in results) if results else 0
+    print(f"{'metric':<{width}}  {'median':>9}  {'p95':>9}")
+    for name, stats in results.items():
+        print(f"{name:<{width}}  {stats['median']:>7.1f}ms  {stats['p95']:>7.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
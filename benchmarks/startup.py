@@ -0,0 +1,134 @@
+"""Startup benchmark: import time and time-to-first-frame of the TUI.
+
+Run from the repository root:
+
+    python benchmarks/startup.py [--runs 5] [--import-budget-ms 500]
+                                 [--first-frame-budget-ms 1500]
+
+Each run starts a fresh interpreter, imports ``prompt_enhancer.app`` and runs
+the app headless until the main menu has been painted. Runs use a throwaway
+HOME and a dummy API key, so no user data is read or written. Exits with 1
+when the median import time or time-to-first-frame is over budget, or when a
+heavy SDK (``anthropic``, ``httpx``, ``pyperclip``) is imported before the
+first frame.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Runs inside the child interpreter and prints one JSON line.
+PROBE = """
+import json, sys, time
+
+t0 = time.perf_counter()
+import prompt_enhancer.app as app_module
+t1 = time.perf_counter()
+
+# Measure the startup path alone, without the post-paint warm-up.
+app_module._warm_up_imports = lambda: None
+
+
+class Probe(app_module.PromptEnhancerApp):
+    first_frame = None
+    heavy = ()
+
+    def on_mount(self):
+        super().on_mount()
+        self.call_after_refresh(self._painted)
+
+    def _painted(self):
+        Probe.first_frame = time.perf_counter()
+        Probe.heavy = [m for m in app_module.WARM_UP_MODULES if m in sys.modules]
+        self.exit()
+
+
+Probe().run(headless=True, size=(100, 40))
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "first_frame_ms": (Probe.first_frame - t0) * 1000,
+    "heavy_modules": Probe.heavy,
+}))
+"""
+
+
+def run_once(home: str) -> dict:
+    env = dict(os.environ)
+    env["HOME"] = home
+    env["ANTHROPIC_API_KEY"] = "sk-ant-benchmark"
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(SRC), env.get("PYTHONPATH", "")) if p
+    )
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"probe failed:\n{proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = wall_ms
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=500.0)
+    parser.add_argument("--first-frame-budget-ms", type=float, default=1500.0)
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as home:
+        results = [run_once(home) for _ in range(args.runs)]
+
+    report = {
+        key: statistics.median(r[key] for r in results)
+        for key in ("import_ms", "first_frame_ms", "process_ms")
+    }
+    heavy = sorted({m for r in results for m in r["heavy_modules"]})
+    report["heavy_modules"] = heavy
+    report["runs"] = args.runs
+
+    failures = []
+    if report["import_ms"] > args.import_budget_ms:
+        failures.append(
+            f"import {report['import_ms']:.0f} ms > budget {args.import_budget_ms:.0f} ms"
+        )
+    if report["first_frame_ms"] > args.first_frame_budget_ms:
+        failures.append(
+            f"first frame {report['first_frame_ms']:.0f} ms > "
+            f"budget {args.first_frame_budget_ms:.0f} ms"
+        )
+    if heavy:
+        failures.append(f"imported before first frame: {', '.join(heavy)}")
+    report["failures"] = failures
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"runs:            {args.runs} (medians)")
+        print(f"import:          {report['import_ms']:.0f} ms")
+        print(f"first frame:     {report['first_frame_ms']:.0f} ms")
+        print(f"whole process:   {report['process_ms']:.0f} ms")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
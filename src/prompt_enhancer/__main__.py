@@ -1,12 +1,175 @@
 """Entry point for python -m prompt_enhancer."""
 
-from prompt_enhancer.app import PromptEnhancerApp
+from __future__ import annotations
 
+import argparse
+import sys
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="prompt-enhancer",
+        description="Enhance rough prompts into detailed, high-quality prompts.",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help=(
+            "Profile screen workers and storage calls; profiles are written to "
+            "~/.prompt_enhancer/profiles/ on exit (same as PROMPT_ENHANCER_PROFILE=1)"
+        ),
+    )
+    parser.add_argument(
+        "--watchdog", action="store_true",
+        help=(
+            "Measure event-loop lag and capture the stacks of UI stalls; press F12 "
+            "for the numbers, a report is written to ~/.prompt_enhancer/watchdog/"
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="Enhance prompts from a JSONL file without the TUI",
+        description=(
+            "Read {template_id, rough_prompt, answers[]} records from a JSONL "
+            "file and write one enhanced-prompt result per line."
+        ),
+    )
+    batch.add_argument("input", help="Input JSONL file")
+    batch.add_argument("output", help="Output JSONL file")
+    batch.add_argument(
+        "-j", "--concurrency", type=int, default=8,
+        help="Number of conversations to run at once (default: 8)",
+    )
+    batch.add_argument(
+        "--unordered", action="store_true",
+        help="Write results as they finish instead of in input order",
+    )
+    batch.add_argument(
+        "--resume", action="store_true",
+        help="Append to the output file, skipping records that already succeeded",
+    )
+    batch.add_argument(
+        "--no-finalize", action="store_true",
+        help="Don't ask for the final prompt once the scripted answers run out",
+    )
+    batch.add_argument(
+        "--backend", choices=["stream", "message-batches"], default="stream",
+        help=(
+            "'stream' runs conversations concurrently; 'message-batches' submits "
+            "each round of turns as one Message Batches job (slower to finish, "
+            "cheaper for large offline runs)"
+        ),
+    )
+    batch.add_argument(
+        "--poll-interval", type=float, default=30.0,
+        help="Seconds between status checks with --backend message-batches",
+    )
+    batch.add_argument("--model", help="Override the configured model")
+    batch.add_argument("--max-tokens", type=int, help="Override max tokens")
+    batch.add_argument("-q", "--quiet", action="store_true", help="No progress output")
+
+    import_templates = subparsers.add_parser(
+        "import-templates",
+        help="Import JSON templates into the SQLite template store",
+    )
+    import_templates.add_argument(
+        "--from", dest="source", help="Template directory (default: the JSON store)"
+    )
+    import_templates.add_argument(
+        "--db", help="SQLite database (default: ~/.prompt_enhancer/templates.db)"
+    )
+
+    metrics = subparsers.add_parser(
+        "metrics",
+        help="Show p50/p95 request latency from the local metrics log",
+    )
+    metrics.add_argument("--json", action="store_true", help="Print JSON rows")
+    return parser
+
+
+def _fmt(value: float | None, unit: str = "s") -> str:
+    if value is None:
+        return "-"
+    return f"{value:.2f}{unit}" if unit == "s" else f"{value:.0f}"
+
+
+def _show_metrics(args) -> int:
+    import json
+
+    from prompt_enhancer.metrics import METRICS_FILE, read_records, summarize
+
+    rows = summarize(read_records())
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    if not rows:
+        print(f"No requests recorded in {METRICS_FILE}")
+        return 0
+    print(
+        f"{'kind':<12} {'model':<28} {'n':>5} {'ttft p50':>9} {'ttft p95':>9} "
+        f"{'total p50':>10} {'total p95':>10} {'tok/s p50':>10}"
+    )
+    for row in rows:
+        print(
+            f"{row['kind']:<12} {row['model']:<28} {row['count']:>5} "
+            f"{_fmt(row['ttft_s_p50']):>9} {_fmt(row['ttft_s_p95']):>9} "
+            f"{_fmt(row['duration_s_p50']):>10} {_fmt(row['duration_s_p95']):>10} "
+            f"{_fmt(row['tokens_per_second_p50'], ''):>10}"
+        )
+    return 0
+
+
+def _import_templates(args) -> int:
+    from pathlib import Path
+
+    from prompt_enhancer.sqlite_store import SqliteTemplateStore
+    from prompt_enhancer.templates import TEMPLATES_DB, TEMPLATES_DIR
+
+    source = Path(args.source) if args.source else TEMPLATES_DIR
+    store = SqliteTemplateStore(Path(args.db) if args.db else TEMPLATES_DB)
+    count = store.import_directory(source)
+    print(f"Imported {count} templates from {source} into {store.path}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.profile:
+        from prompt_enhancer import profiling
+
+        profiling.enable()
+
+    if args.command == "batch":
+        from prompt_enhancer.batch import run_from_args
+
+        return run_from_args(args)
+    if args.command == "import-templates":
+        return _import_templates(args)
+    if args.command == "metrics":
+        return _show_metrics(args)
+
+    from prompt_enhancer.app import PromptEnhancerApp
+
+    if args.watchdog:
+        from prompt_enhancer import watchdog
+
+        watchdog.request()
 
-def main():
     app = PromptEnhancerApp()
     app.run()
+    if app.watchdog_report is not None:
+        print(f"Event-loop lag report written to {app.watchdog_report}")
+
+    from prompt_enhancer import profiling
+
+    profiler = profiling.active()
+    if profiler is not None:
+        directory = profiler.dump()
+        if directory is not None:
+            print(f"Profiles written to {directory}")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
+from dataclasses import dataclass
 from typing import AsyncIterator
 
-import anthropic
-
+from prompt_enhancer.cache import ContentCache, content_key, get_cache
+from prompt_enhancer.clients import client_for_config
+from prompt_enhancer.history import HistoryCompactor
+from prompt_enhancer.journal import SessionJournal
+from prompt_enhancer.metrics import RequestMetrics, RequestTimer, record
 from prompt_enhancer.models import Template, AppConfig
+from prompt_enhancer.resilience import resilient_stream
+from prompt_enhancer.tag_stream import TagEvent, TagStreamParser
 
 PROCESS_INSTRUCTIONS = """\
 You are helping the user craft a high-quality, detailed prompt. Follow this process:
@@ -23,19 +30,90 @@ You are helping the user craft a high-quality, detailed prompt. Follow this proc
 
 Important: Only wrap the final enhanced prompt in the tags, not your conversational responses or questions."""
 
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+@dataclass
+class TokenUsage:
+    """Input/output token counts, including prompt-cache reads and writes."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+
+    @classmethod
+    def from_api(cls, usage) -> TokenUsage:
+        """Build from an SDK ``Usage`` object (cache fields may be None)."""
+        return cls(
+            input_tokens=usage.input_tokens or 0,
+            output_tokens=usage.output_tokens or 0,
+            cache_creation_input_tokens=(
+                getattr(usage, "cache_creation_input_tokens", None) or 0
+            ),
+            cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", None)
+            or 0,
+        )
+
+    def add(self, other: TokenUsage) -> None:
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_creation_input_tokens += other.cache_creation_input_tokens
+        self.cache_read_input_tokens += other.cache_read_input_tokens
+
+
+@dataclass
+class TurnRecord:
+    """Which model answered a turn, and how long it took."""
+
+    model: str
+    phase: str  # "question" or "prompt"
+    first_token_s: float | None = None
+    duration_s: float = 0.0
+    replayed: bool = False
+
 
 class EnhancementSession:
     """Manages a multi-turn conversation for prompt enhancement."""
 
-    def __init__(self, template: Template, config: AppConfig):
+    def __init__(
+        self,
+        template: Template,
+        config: AppConfig,
+        journal: SessionJournal | None = None,
+    ):
         self.template = template
         self.config = config
+        self.journal = journal
         self.messages: list[dict] = []
         self._last_assistant_text = ""
-        # Pass explicit key if set, otherwise let the SDK read ANTHROPIC_API_KEY
-        self._client = anthropic.AsyncAnthropic(
-            api_key=config.api_key or None
-        )
+        self._last_enhanced_prompt: str | None = None
+        self._last_events: list[TagEvent] = []
+        self._history = HistoryCompactor(config.history_token_budget)
+        self.last_usage = TokenUsage()
+        self.total_usage = TokenUsage()
+        self.last_replayed = False
+        self.turns: list[TurnRecord] = []
+        self.in_flight: RequestTimer | None = None
+        self.last_metrics: RequestMetrics | None = None
+        self._prompt_produced = False
+        self._client = None
+
+    def update_config(self, config: AppConfig) -> None:
+        """Apply new settings to the following turns of this session."""
+        self.config = config
+        self._history.budget = config.history_token_budget
+        self._client = None
+
+    @property
+    def client(self):
+        """Shared pooled client, created (and the SDK imported) on first use.
+
+        Falls back to ANTHROPIC_API_KEY if no key is set.
+        """
+        if self._client is None:
+            self._client = client_for_config(self.config)
+        return self._client
 
     def _build_system_prompt(self) -> str:
         parts = []
@@ -52,32 +130,241 @@ class EnhancementSession:
         parts.append(PROCESS_INSTRUCTIONS)
         return "\n\n".join(parts)
 
-    async def send_message(self, user_text: str) -> AsyncIterator[str]:
-        """Send a user message and yield streaming response chunks."""
+    @property
+    def caching_enabled(self) -> bool:
+        return self.config.prompt_caching or self.template.prompt_caching
+
+    def _build_system_param(self) -> str | list[dict]:
+        system = self._build_system_prompt()
+        if not self.caching_enabled:
+            return system
+        return [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+
+    def _build_request_messages(self) -> list[dict]:
+        """Return the messages to send, with a cache breakpoint on the last one.
+
+        Long histories are compacted first (see ``history.HistoryCompactor``).
+        The breakpoint makes the whole conversation so far a cacheable prefix,
+        so the next turn only pays full price for the new messages.
+        """
+        messages = self._history.compact(self.messages)
+        if not self.caching_enabled or not messages:
+            return messages
+        *prefix, last = messages
+        content = last["content"]
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        content = [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}]
+        return [*prefix, {"role": last["role"], "content": content}]
+
+    @property
+    def fast_model(self) -> str:
+        """Model for clarifying-question turns; empty when routing is off."""
+        return self.template.fast_model or self.config.fast_model
+
+    def route(self) -> tuple[str, str]:
+        """Return ``(model, phase)`` for the next turn.
+
+        The first ``routing_question_turns`` replies are expected to be
+        clarifying questions and go to the fast model. After that, and for
+        every revision once an ``<enhanced_prompt>`` has been produced, the
+        configured model answers.
+        """
+        fast = self.fast_model
+        if not fast or fast == self.config.model or self._prompt_produced:
+            return self.config.model, "prompt"
+        replies = sum(1 for m in self.messages if m["role"] == "assistant")
+        if replies >= self.config.routing_question_turns:
+            return self.config.model, "prompt"
+        return fast, "question"
+
+    def request_params(self) -> dict:
+        """Build the Messages API parameters for the conversation so far."""
+        return {
+            "model": self.route()[0],
+            "max_tokens": self.config.max_tokens,
+            "system": self._build_system_param(),
+            "messages": self._build_request_messages(),
+        }
+
+    def response_cache_key(self) -> str:
+        """Replay-cache key over model, system prompt, history and max_tokens."""
+        return content_key(
+            self.route()[0],
+            self._build_system_prompt(),
+            self.messages,
+            self.config.max_tokens,
+        )
+
+    def restore(self, messages: list[dict]) -> None:
+        """Continue from completed turns (e.g. replayed from a journal)."""
+        self.messages = list(messages)
+        self._last_assistant_text = ""
+        self._last_enhanced_prompt = None
+        for message in self.messages:
+            if message["role"] == "assistant":
+                self._last_assistant_text = message["content"]
+                self._last_enhanced_prompt = find_enhanced_prompt(message["content"])
+                if self._last_enhanced_prompt is not None:
+                    self._prompt_produced = True
+
+    def add_user_message(self, user_text: str) -> None:
         self.messages.append({"role": "user", "content": user_text})
         self._last_assistant_text = ""
+        self._last_enhanced_prompt = None
 
-        async with self._client.messages.stream(
-            model=self.config.model,
-            max_tokens=self.config.max_tokens,
-            system=self._build_system_prompt(),
-            messages=self.messages,
-        ) as stream:
-            async for text in stream.text_stream:
-                self._last_assistant_text += text
-                yield text
+    def add_assistant_message(self, text: str) -> None:
+        """Record a complete assistant reply (e.g. one produced by a batch job)."""
+        self._last_assistant_text = text
+        self._last_enhanced_prompt = find_enhanced_prompt(text)
+        if self._last_enhanced_prompt is not None:
+            self._prompt_produced = True
+        self.messages.append({"role": "assistant", "content": text})
+
+    async def send_message(self, user_text: str) -> AsyncIterator[str]:
+        """Send a user message and yield streaming response chunks.
+
+        Each chunk is also run through an incremental ``<enhanced_prompt>``
+        parser; the events for the chunk just yielded are in ``last_events``.
+        If the request fails (after any retries) the user message is taken
+        back out, so the conversation is as it was before the call.
+        """
+        rollback = (
+            len(self.messages),
+            self._last_assistant_text,
+            self._last_enhanced_prompt,
+        )
+        self.add_user_message(user_text)
+        journal = self.journal
+        if journal is not None:
+            journal.user(user_text)
+        parser = TagStreamParser("enhanced_prompt")
+        parts: list[str] = []
+        model, phase = self.route()
+        timer = RequestTimer("session", model, self.template.id, phase)
+        self.in_flight = timer
+
+        cache = key = cached = None
+        if self.config.response_cache:
+            cache = response_cache(self.config)
+            key = self.response_cache_key()
+            cached = cache.get(key)
+        self.last_replayed = cached is not None
+
+        try:
+            if cached is not None:
+                async for text in replay_chunks(
+                    cached["text"], self.config.replay_chars_per_second
+                ):
+                    timer.token()
+                    parts.append(text)
+                    if journal is not None:
+                        journal.chunk(text)
+                    self._last_events = parser.feed(text)
+                    yield text
+                usage = TokenUsage()
+            else:
+                async with resilient_stream(
+                    self.config, self.client, self.request_params(), timer
+                ) as stream:
+                    async for text in stream.text_stream:
+                        timer.token()
+                        parts.append(text)
+                        if journal is not None:
+                            journal.chunk(text)
+                        self._last_events = parser.feed(text)
+                        yield text
+                    final = await stream.get_final_message()
+                usage = TokenUsage.from_api(final.usage)
+        except BaseException as exc:
+            count, self._last_assistant_text, self._last_enhanced_prompt = rollback
+            del self.messages[count:]
+            self._last_events = []
+            if isinstance(exc, Exception):
+                record(self.config, timer.finish(error=type(exc).__name__))
+                if journal is not None:
+                    journal.abort()
+            raise
+        finally:
+            self.in_flight = None
+        if journal is not None:
+            journal.done()
+        self._last_events = parser.close()
+        self._last_assistant_text = "".join(parts)
+        if cache is not None and cached is None:
+            cache.put(key, {"text": self._last_assistant_text})
+
+        self.last_usage = usage
+        self.total_usage.add(self.last_usage)
 
         self.messages.append(
             {"role": "assistant", "content": self._last_assistant_text}
         )
+        self._last_enhanced_prompt = parser.latest
+        if parser.latest is not None:
+            self._prompt_produced = True
+        metrics = timer.finish(usage, replayed=self.last_replayed)
+        self.last_metrics = metrics
+        record(self.config, metrics)
+        self.turns.append(
+            TurnRecord(
+                model=model,
+                phase=phase,
+                first_token_s=metrics.first_token_s,
+                duration_s=metrics.duration_s,
+                replayed=metrics.replayed,
+            )
+        )
+
+    @property
+    def last_events(self) -> list[TagEvent]:
+        return self._last_events
+
+    async def stream_events(self, user_text: str) -> AsyncIterator[TagEvent]:
+        """Send a user message and yield parse events instead of raw chunks.
+
+        ``text`` events are conversational text; ``start``/``delta``/``end``
+        events stream the contents of each ``<enhanced_prompt>`` block.
+        """
+        async for _ in self.send_message(user_text):
+            for event in self._last_events:
+                yield event
+        for event in self._last_events:
+            yield event
 
     def extract_enhanced_prompt(self) -> str | None:
-        """Extract the latest enhanced prompt from the last response."""
-        if not self._last_assistant_text:
-            return None
-        matches = re.findall(
-            r"<enhanced_prompt>\s*(.*?)\s*</enhanced_prompt>",
-            self._last_assistant_text,
-            re.DOTALL,
-        )
-        return matches[-1] if matches else None
+        """Return the latest enhanced prompt from the last response."""
+        return self._last_enhanced_prompt
+
+
+def response_cache(config: AppConfig) -> ContentCache:
+    """The opt-in cache of complete responses (``config.response_cache``)."""
+    return get_cache("responses", config)
+
+
+_REPLAY_CHUNK_RE = re.compile(r"\S*\s*")
+
+
+async def replay_chunks(text: str, chars_per_second: float) -> AsyncIterator[str]:
+    """Yield ``text`` word by word, paced like a live stream.
+
+    A pace of 0 yields chunks as fast as the event loop allows.
+    """
+    for chunk in _REPLAY_CHUNK_RE.findall(text):
+        if not chunk:
+            continue
+        delay = len(chunk) / chars_per_second if chars_per_second > 0 else 0
+        await asyncio.sleep(delay)
+        yield chunk
+
+
+def find_enhanced_prompt(text: str) -> str | None:
+    """Return the last <enhanced_prompt> block in ``text``, if any."""
+    if not text:
+        return None
+    matches = re.findall(
+        r"<enhanced_prompt>\s*(.*?)\s*</enhanced_prompt>",
+        text,
+        re.DOTALL,
+    )
+    return matches[-1] if matches else None
@@ -3,16 +3,34 @@
 from pathlib import Path
 
 from textual.app import App
+from textual.binding import Binding
 
 from prompt_enhancer.screens.main_menu import MainMenuScreen
 
 CSS_PATH = Path(__file__).parent / "styles" / "app.tcss"
 
+# Heavy modules kept off the startup path and imported after the first frame.
+WARM_UP_MODULES = ("anthropic", "httpx", "pyperclip")
+
+
+def _warm_up_imports() -> None:
+    import importlib
+
+    for name in WARM_UP_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
 
 class PromptEnhancerApp(App):
     TITLE = "Prompt Enhancer"
     SUB_TITLE = "AI-powered prompt refinement"
     CSS_PATH = CSS_PATH
+    BINDINGS = [
+        Binding("f12", "show_watchdog", "Loop lag", show=False),
+    ]
+    watchdog_report: Path | None = None
 
     def on_mount(self) -> None:
         self.theme = "tokyo-night"
@@ -22,6 +40,15 @@ class PromptEnhancerApp(App):
         config = load_config()
         self.push_screen(MainMenuScreen())
 
+        from prompt_enhancer import watchdog
+
+        if config.watchdog or watchdog.requested():
+            import asyncio
+
+            watchdog.start_watchdog(
+                asyncio.get_running_loop(), stall_ms=config.watchdog_stall_ms
+            )
+
         if not config.api_key:
             from prompt_enhancer.screens.api_key_prompt import ApiKeyPromptScreen
 
@@ -31,3 +58,32 @@ class PromptEnhancerApp(App):
                 self.notify("API key saved. You're all set!")
 
             self.push_screen(ApiKeyPromptScreen(), callback=on_key_entered)
+
+        # Import the SDKs in the background once the first frame is up, so the
+        # first API call or clipboard copy doesn't pay for them.
+        self.call_after_refresh(
+            self.run_worker,
+            _warm_up_imports,
+            thread=True,
+            group="warm-up",
+            exit_on_error=False,
+        )
+
+    def action_show_watchdog(self) -> None:
+        from prompt_enhancer.screens.watchdog import WatchdogScreen
+
+        if not isinstance(self.screen, WatchdogScreen):
+            self.push_screen(WatchdogScreen())
+
+    async def on_unmount(self) -> None:
+        import asyncio
+
+        from prompt_enhancer.clients import close_clients
+        from prompt_enhancer.persistence import get_writer
+        from prompt_enhancer.watchdog import stop_watchdog
+
+        self.watchdog_report = stop_watchdog()
+
+        await close_clients()
+        # Make sure queued template/config saves reach disk before exiting.
+        await asyncio.to_thread(get_writer().flush)
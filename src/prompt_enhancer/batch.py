@@ -0,0 +1,387 @@
+"""Headless batch enhancement driven from the command line.
+
+Reads a JSONL file of ``{"template_id", "rough_prompt", "answers"}`` records,
+runs an EnhancementSession for each one (feeding the scripted answers to the
+clarifying questions) and writes one JSONL result per record. This module
+must not import Textual so that ``prompt-enhancer batch`` starts quickly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from prompt_enhancer.api import EnhancementSession
+from prompt_enhancer.clients import close_clients
+from prompt_enhancer.config import load_config
+from prompt_enhancer.models import AppConfig, Template
+from prompt_enhancer.persistence import atomic_write_text
+from prompt_enhancer.templates import get_template
+
+FINALIZE_MESSAGE = (
+    "I have no further details to add. Please generate the enhanced prompt "
+    "now using what you know so far."
+)
+
+
+@dataclass
+class BatchRecord:
+    index: int
+    template_id: str
+    rough_prompt: str
+    answers: list[str] = field(default_factory=list)
+    id: str | None = None
+
+    @classmethod
+    def from_dict(cls, index: int, data: dict) -> BatchRecord:
+        return cls(
+            index=index,
+            template_id=data["template_id"],
+            rough_prompt=data["rough_prompt"],
+            answers=list(data.get("answers") or []),
+            id=data.get("id"),
+        )
+
+
+@dataclass
+class BatchSummary:
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+def read_records(path: Path) -> Iterator[BatchRecord | dict]:
+    """Yield records in file order, or an error result for unparsable lines.
+
+    A record's index is its position among the non-blank lines, so it stays
+    stable across resumed runs.
+    """
+    with path.open() as f:
+        index = 0
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield BatchRecord.from_dict(index, json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                yield {"index": index, "error": f"Invalid record: {e}"}
+            index += 1
+
+
+def prepare_resume(path: Path) -> set[int]:
+    """Keep one successful result per index in ``path`` and return the indices.
+
+    Failed records are run again on resume, so their old lines (and any
+    torn last line) are dropped first; otherwise the output would end up
+    with two results for the same index.
+    """
+    done: set[int] = set()
+    if not path.exists():
+        return done
+    kept = []
+    with path.open() as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # torn last line from an interrupted run
+            index = result.get("index")
+            if index is None or result.get("error") or index in done:
+                continue
+            done.add(index)
+            kept.append(line if line.endswith("\n") else line + "\n")
+    atomic_write_text(path, "".join(kept))
+    return done
+
+
+async def enhance_record(
+    record: BatchRecord,
+    template: Template,
+    config: AppConfig,
+    finalize: bool = True,
+) -> dict:
+    """Run one scripted enhancement conversation and return its result."""
+    session = EnhancementSession(template, config)
+    script = [record.rough_prompt, *record.answers]
+    if finalize:
+        script.append(FINALIZE_MESSAGE)
+
+    enhanced = None
+    turns = 0
+    for message in script:
+        async for _ in session.send_message(message):
+            pass
+        turns += 1
+        enhanced = session.extract_enhanced_prompt()
+        if enhanced:
+            break
+
+    result = {"index": record.index}
+    if record.id is not None:
+        result["id"] = record.id
+    result.update(
+        template_id=record.template_id,
+        enhanced_prompt=enhanced,
+        turns=turns,
+        error=None if enhanced else "No enhanced prompt was produced",
+    )
+    return result
+
+
+class _ResultWriter:
+    """Writes results as they finish, or in input order when ``ordered``.
+
+    In ordered mode, results that finish ahead of an earlier, slower record
+    are held back; ``wait_for_room()`` blocks once ``max_held`` of them are,
+    so one slow record can't make the rest pile up in memory.
+    """
+
+    def __init__(self, out: TextIO, ordered: bool, max_held: int = 0) -> None:
+        self._out = out
+        self._ordered = ordered
+        self._max_held = max_held
+        self._expected: deque[int] = deque()
+        self._finished: dict[int, dict] = {}
+        self._drained = asyncio.Event()
+
+    def expect(self, index: int) -> None:
+        if self._ordered:
+            self._expected.append(index)
+
+    def write(self, result: dict) -> None:
+        if not self._ordered:
+            self._emit(result)
+            return
+        self._finished[result["index"]] = result
+        while self._expected and self._expected[0] in self._finished:
+            self._emit(self._finished.pop(self._expected.popleft()))
+            self._drained.set()
+
+    async def wait_for_room(self) -> None:
+        # The record holding the others back is always with a worker that
+        # isn't waiting here (records are taken in order), so this ends.
+        while self._max_held and len(self._finished) >= self._max_held:
+            self._drained.clear()
+            await self._drained.wait()
+
+    def _emit(self, result: dict) -> None:
+        # One flushed line per record, so an interrupted run can be resumed.
+        self._out.write(json.dumps(result) + "\n")
+        self._out.flush()
+
+
+async def run_batch(
+    input_path: Path,
+    output_path: Path,
+    config: AppConfig,
+    concurrency: int = 8,
+    ordered: bool = True,
+    resume: bool = False,
+    finalize: bool = True,
+    progress: TextIO | None = None,
+) -> BatchSummary:
+    """Enhance every record in ``input_path`` and write results to ``output_path``."""
+    summary = BatchSummary()
+    completed = prepare_resume(output_path) if resume else set()
+    templates: dict[str, Template | None] = {}
+    queue: asyncio.Queue[BatchRecord | None] = asyncio.Queue(maxsize=concurrency * 2)
+
+    with output_path.open("a" if resume else "w") as out:
+        writer = _ResultWriter(out, ordered, max_held=queue.maxsize)
+
+        def record_result(result: dict) -> None:
+            if result.get("error"):
+                summary.failed += 1
+            else:
+                summary.succeeded += 1
+            writer.write(result)
+            if progress is not None:
+                done = summary.succeeded + summary.failed
+                progress.write(
+                    f"\r{done} done ({summary.failed} failed, "
+                    f"{summary.skipped} skipped)"
+                )
+                progress.flush()
+
+        async def worker() -> None:
+            while (record := await queue.get()) is not None:
+                template = templates.get(record.template_id)
+                if template is None:
+                    result = {
+                        "index": record.index,
+                        "template_id": record.template_id,
+                        "error": f"Unknown template: {record.template_id}",
+                    }
+                else:
+                    try:
+                        result = await enhance_record(
+                            record, template, config, finalize
+                        )
+                    except Exception as e:
+                        result = {
+                            "index": record.index,
+                            "template_id": record.template_id,
+                            "error": str(e),
+                        }
+                if record.id is not None:
+                    result.setdefault("id", record.id)
+                record_result(result)
+                await writer.wait_for_room()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            for record in read_records(input_path):
+                if isinstance(record, dict):
+                    writer.expect(record["index"])
+                    record_result(record)
+                    await writer.wait_for_room()
+                    continue
+                if record.index in completed:
+                    summary.skipped += 1
+                    continue
+                if record.template_id not in templates:
+                    templates[record.template_id] = get_template(record.template_id)
+                writer.expect(record.index)
+                await queue.put(record)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            if progress is not None:
+                progress.write("\n")
+
+    return summary
+
+
+async def run_message_batch_job(
+    input_path: Path,
+    output_path: Path,
+    config: AppConfig,
+    resume: bool = False,
+    finalize: bool = True,
+    poll_interval: float = 30.0,
+    progress: TextIO | None = None,
+) -> BatchSummary:
+    """Like ``run_batch``, but submits the turns through the Message Batches API.
+
+    Results are written as each round finishes (in completion order), so an
+    interrupted run keeps everything finished so far.
+    """
+    from prompt_enhancer.batch_api import BatchProgress, enhance_with_message_batches
+
+    summary = BatchSummary()
+    completed = prepare_resume(output_path) if resume else set()
+    templates: dict[str, Template] = {}
+    records: list[BatchRecord] = []
+
+    with output_path.open("a" if resume else "w") as out:
+        writer = _ResultWriter(out, ordered=False)
+
+        def record_result(result: dict) -> None:
+            if result.get("error"):
+                summary.failed += 1
+            else:
+                summary.succeeded += 1
+            writer.write(result)
+
+        for record in read_records(input_path):
+            if isinstance(record, dict):
+                record_result(record)
+                continue
+            if record.index in completed:
+                summary.skipped += 1
+                continue
+            if record.template_id not in templates:
+                template = get_template(record.template_id)
+                if template is None:
+                    result = {
+                        "index": record.index,
+                        "template_id": record.template_id,
+                        "error": f"Unknown template: {record.template_id}",
+                    }
+                    if record.id is not None:
+                        result["id"] = record.id
+                    record_result(result)
+                    continue
+                templates[record.template_id] = template
+            records.append(record)
+
+        def report(status: BatchProgress) -> None:
+            if progress is not None:
+                progress.write(
+                    f"\rround {status.round} batch {status.batch_id}: "
+                    f"{status.processing} processing, {status.succeeded} succeeded, "
+                    f"{status.errored} errored"
+                )
+                progress.flush()
+
+        if records:
+            await enhance_with_message_batches(
+                records,
+                templates,
+                config,
+                poll_interval=poll_interval,
+                finalize=finalize,
+                on_progress=report,
+                on_result=record_result,
+            )
+            if progress is not None:
+                progress.write("\n")
+    return summary
+
+
+def run_from_args(args) -> int:
+    """Entry point for ``prompt-enhancer batch``."""
+    config = load_config()
+    if args.model:
+        config.model = args.model
+    if args.max_tokens:
+        config.max_tokens = args.max_tokens
+    if not config.api_key:
+        print(
+            "No API key configured. Set ANTHROPIC_API_KEY or run prompt-enhancer "
+            "once to save one.",
+            file=sys.stderr,
+        )
+        return 2
+
+    async def run() -> BatchSummary:
+        progress = None if args.quiet else sys.stderr
+        try:
+            if args.backend == "message-batches":
+                return await run_message_batch_job(
+                    Path(args.input),
+                    Path(args.output),
+                    config,
+                    resume=args.resume,
+                    finalize=not args.no_finalize,
+                    poll_interval=args.poll_interval,
+                    progress=progress,
+                )
+            return await run_batch(
+                Path(args.input),
+                Path(args.output),
+                config,
+                concurrency=max(1, args.concurrency),
+                ordered=not args.unordered,
+                resume=args.resume,
+                finalize=not args.no_finalize,
+                progress=progress,
+            )
+        finally:
+            await close_clients()
+
+    summary = asyncio.run(run())
+    print(
+        f"{summary.succeeded} succeeded, {summary.failed} failed, "
+        f"{summary.skipped} skipped",
+        file=sys.stderr,
+    )
+    return 1 if summary.failed else 0
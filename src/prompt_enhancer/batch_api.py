@@ -0,0 +1,218 @@
+"""Message Batches backend for offline bulk enhancement jobs.
+
+Instead of streaming each conversation turn, every pending conversation's
+next turn is packed into one Message Batches submission. Scripted
+conversations take one batch round per turn: after each round, records
+that produced an ``<enhanced_prompt>`` are finished and the rest get their
+next scripted answer in the following round.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+from prompt_enhancer.api import EnhancementSession, find_enhanced_prompt
+from prompt_enhancer.batch import FINALIZE_MESSAGE, BatchRecord
+from prompt_enhancer.clients import client_for_config
+from prompt_enhancer.models import AppConfig, Template
+from prompt_enhancer.resilience import RetryPolicy, call_with_retries
+
+# API limit is 100,000 requests per batch; stay well below the size cap too.
+MAX_REQUESTS_PER_BATCH = 10_000
+
+
+@dataclass
+class _Job:
+    record: BatchRecord
+    session: EnhancementSession
+    script: deque[str]
+    turns: int = 0
+    result: dict | None = None
+
+    def finish(self, enhanced: str | None = None, error: str | None = None) -> None:
+        result = {"index": self.record.index}
+        if self.record.id is not None:
+            result["id"] = self.record.id
+        result.update(
+            template_id=self.record.template_id,
+            enhanced_prompt=enhanced,
+            turns=self.turns,
+            error=error,
+        )
+        self.result = result
+
+
+@dataclass
+class BatchProgress:
+    round: int
+    batch_id: str
+    processing: int = 0
+    succeeded: int = 0
+    errored: int = 0
+
+
+def _custom_id(record: BatchRecord) -> str:
+    # custom_id must match ^[a-zA-Z0-9_-]{1,64}$, so use the record index.
+    return f"rec-{record.index}"
+
+
+async def _wait_for_batch(
+    client,
+    batch_id: str,
+    poll_interval: float,
+    round_number: int,
+    on_progress: Callable[[BatchProgress], None] | None,
+    policy: RetryPolicy,
+):
+    while True:
+        batch = await call_with_retries(
+            lambda: client.messages.batches.retrieve(batch_id), policy
+        )
+        if on_progress is not None:
+            counts = batch.request_counts
+            on_progress(
+                BatchProgress(
+                    round=round_number,
+                    batch_id=batch_id,
+                    processing=counts.processing,
+                    succeeded=counts.succeeded,
+                    errored=counts.errored,
+                )
+            )
+        if batch.processing_status == "ended":
+            return batch
+        await asyncio.sleep(poll_interval)
+
+
+async def _run_round(
+    client,
+    jobs: dict[str, _Job],
+    poll_interval: float,
+    round_number: int,
+    on_progress: Callable[[BatchProgress], None] | None,
+    policy: RetryPolicy,
+) -> None:
+    """Submit one turn for every job in ``jobs`` and apply the results."""
+    requests = [
+        {"custom_id": custom_id, "params": job.session.request_params()}
+        for custom_id, job in jobs.items()
+    ]
+    # Not retried: creating a batch isn't idempotent, and after a timeout or
+    # 5xx the batch may have been accepted anyway, so a retry could pay twice.
+    batch = await client.messages.batches.create(requests=requests)
+    await _wait_for_batch(
+        client, batch.id, poll_interval, round_number, on_progress, policy
+    )
+
+    seen: set[str] = set()
+    results = await call_with_retries(
+        lambda: client.messages.batches.results(batch.id), policy
+    )
+    async for entry in results:
+        job = jobs.get(entry.custom_id)
+        if job is None:
+            continue
+        seen.add(entry.custom_id)
+        result = entry.result
+        if result.type != "succeeded":
+            detail = ""
+            if result.type == "errored":
+                detail = f": {result.error.error.message}"
+            job.finish(error=f"Batch request {result.type}{detail}")
+            continue
+        text = "".join(
+            block.text for block in result.message.content if block.type == "text"
+        )
+        job.session.add_assistant_message(text)
+        job.turns += 1
+        enhanced = find_enhanced_prompt(text)
+        if enhanced:
+            job.finish(enhanced=enhanced)
+        elif not job.script:
+            job.finish(error="No enhanced prompt was produced")
+
+    for custom_id in jobs.keys() - seen:
+        jobs[custom_id].finish(error="Missing from batch results")
+
+
+async def _run_chunk(
+    client,
+    jobs: dict[str, _Job],
+    poll_interval: float,
+    round_number: int,
+    on_progress: Callable[[BatchProgress], None] | None,
+    on_result: Callable[[dict], None] | None,
+    policy: RetryPolicy,
+) -> None:
+    """``_run_round``, failing only this chunk's jobs if the round fails."""
+    try:
+        await _run_round(client, jobs, poll_interval, round_number, on_progress, policy)
+    except Exception as e:
+        for job in jobs.values():
+            if job.result is None:
+                job.finish(error=f"Batch round {round_number} failed: {e}")
+    if on_result is not None:
+        for job in jobs.values():
+            if job.result is not None:
+                on_result(job.result)
+
+
+async def enhance_with_message_batches(
+    records: list[BatchRecord],
+    templates: dict[str, Template],
+    config: AppConfig,
+    poll_interval: float = 30.0,
+    finalize: bool = True,
+    client=None,
+    on_progress: Callable[[BatchProgress], None] | None = None,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Enhance ``records`` via the Message Batches API.
+
+    Returns one result per record, in input order, with the same shape as
+    ``batch.enhance_record``; ``on_result`` is also called with each result
+    as soon as its round finishes. A round that fails fails only its own
+    records. ``client`` defaults to the pooled client for ``config`` (point
+    ``config.base_url`` at a stand-in server such as
+    ``benchmarks/fake_server.py`` to test).
+    """
+    client = client or client_for_config(config)
+    policy = RetryPolicy.from_config(config)
+    jobs: dict[str, _Job] = {}
+    for record in records:
+        script = deque([record.rough_prompt, *record.answers])
+        if finalize:
+            script.append(FINALIZE_MESSAGE)
+        jobs[_custom_id(record)] = _Job(
+            record=record,
+            session=EnhancementSession(templates[record.template_id], config),
+            script=script,
+        )
+
+    round_number = 0
+    pending = dict(jobs)
+    while pending:
+        round_number += 1
+        for job in pending.values():
+            job.session.add_user_message(job.script.popleft())
+        chunks = list(pending.items())
+        await asyncio.gather(
+            *(
+                _run_chunk(
+                    client,
+                    dict(chunks[i : i + MAX_REQUESTS_PER_BATCH]),
+                    poll_interval,
+                    round_number,
+                    on_progress,
+                    on_result,
+                    policy,
+                )
+                for i in range(0, len(chunks), MAX_REQUESTS_PER_BATCH)
+            )
+        )
+        pending = {cid: job for cid, job in pending.items() if job.result is None}
+
+    return [job.result for job in jobs.values()]
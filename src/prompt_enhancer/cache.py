@@ -0,0 +1,208 @@
+"""Content-addressed cache with an in-memory LRU tier and an on-disk tier.
+
+Values are stored under a SHA-256 of the request content, so identical
+requests hit the same entry no matter which screen (or which process) made
+them. The disk tier lives under ``~/.prompt_enhancer/cache/<name>/`` as one
+JSON file per entry; entries expire after a TTL and the least recently used
+ones are evicted once the directory grows past a size limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from prompt_enhancer.models import AppConfig
+from prompt_enhancer.persistence import get_writer
+
+CACHE_DIR = Path.home() / ".prompt_enhancer" / "cache"
+
+# Evicting down to a fraction of the limit keeps eviction off the common path.
+_EVICT_TO = 0.8
+
+
+def content_key(*parts: Any) -> str:
+    """Hash JSON-serializable ``parts`` into a stable cache key."""
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ContentCache:
+    """Two-tier cache of JSON-serializable values.
+
+    ``get`` checks memory, then disk (promoting disk hits into memory).
+    ``put`` stores in both; disk writes go through the background writer.
+    A ``ttl`` or ``max_bytes`` of 0 disables expiry or eviction.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        memory_entries: int = 256,
+        max_bytes: int = 50 * 1024 * 1024,
+        ttl: float = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: int | None = None
+        self._evicting = False
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl) and self._clock() - stored_at > self.ttl
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        stored_at = self._clock()
+        text = json.dumps({"stored_at": stored_at, "value": value})
+        with self._lock:
+            self._remember(key, (stored_at, value))
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(text)
+        get_writer().write(self._path(key), text)
+        if self.max_bytes:
+            self._schedule_eviction()
+
+    def _remember(self, key: str, entry: tuple[float, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> tuple[float, Any] | None:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            stored_at = float(data["stored_at"])
+            value = data["value"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if self._expired(stored_at):
+            get_writer().delete(path)
+            return None
+        try:
+            os.utime(path)  # mtime doubles as last-used time for eviction
+        except OSError:
+            pass
+        return stored_at, value
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        try:
+            shards = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            with os.scandir(shard.path) as files:
+                for entry in files:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        return entries
+
+    def _schedule_eviction(self) -> None:
+        """Size the disk tier (and evict) on a thread when it may be too big."""
+        with self._lock:
+            if self._evicting or (
+                self._disk_bytes is not None and self._disk_bytes <= self.max_bytes
+            ):
+                return
+            self._evicting = True
+        threading.Thread(target=self._evict, name="cache-evict", daemon=True).start()
+
+    def _evict(self) -> None:
+        try:
+            self._evict_lru()
+        finally:
+            with self._lock:
+                self._evicting = False
+
+    def _evict_lru(self) -> None:
+        # Let queued entry writes land first so the scan sees them.
+        get_writer().flush()
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            writer = get_writer()
+            target = self.max_bytes * _EVICT_TO
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= target:
+                    break
+                writer.delete(path)
+                total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = 0
+        writer = get_writer()
+        for _, _, path in self._entries():
+            writer.delete(path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+_caches: dict[str, ContentCache] = {}
+
+
+def get_cache(name: str, config: AppConfig) -> ContentCache:
+    """Return the process-wide cache stored under ``CACHE_DIR / name``."""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = ContentCache(
+            CACHE_DIR / name,
+            max_bytes=int(config.cache_max_mb * 1024 * 1024),
+            ttl=config.cache_ttl_days * 24 * 3600,
+        )
+        _caches[name] = cache
+    return cache
@@ -0,0 +1,121 @@
+"""Process-wide pool of Anthropic clients.
+
+Enhancement sessions, the template wizard and API key validation all get
+their client from here, so back-to-back requests reuse one HTTP connection
+pool (and its warm keep-alive connections) instead of opening a new one each
+time. Clients are keyed on (api key, base URL, timeout); the connection
+limits are applied when a client is first created.
+
+The SDK's own retries are turned off: ``resilience`` retries every request
+(and knows not to retry a stream that has already produced text).
+
+``anthropic`` and ``httpx`` are imported on first use rather than with this
+module, so screens can depend on it without slowing down startup.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from prompt_enhancer.models import AppConfig
+
+if TYPE_CHECKING:
+    import anthropic
+
+
+@dataclass(frozen=True)
+class PoolLimits:
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> PoolLimits:
+        return cls(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+
+
+_clients: dict[tuple, anthropic.AsyncAnthropic] = {}
+
+
+def _client_key(
+    api_key: str | None, base_url: str | None, timeout: float | None
+) -> tuple:
+    # Resolve the SDK's environment fallback up front so that a key change
+    # (e.g. from Settings) maps to a different pooled client.
+    return (
+        api_key or os.environ.get("ANTHROPIC_API_KEY") or None,
+        base_url or None,
+        timeout,
+    )
+
+
+def get_client(
+    api_key: str | None = None,
+    *,
+    base_url: str | None = None,
+    timeout: float | None = None,
+    limits: PoolLimits | None = None,
+) -> anthropic.AsyncAnthropic:
+    """Return the shared client for these settings, creating it on first use."""
+    key = _client_key(api_key, base_url, timeout)
+    client = _clients.get(key)
+    if client is None:
+        import anthropic
+        import httpx
+
+        limits = limits or PoolLimits()
+        http_client = anthropic.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=limits.keepalive_expiry,
+            ),
+        )
+        kwargs = {}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        client = anthropic.AsyncAnthropic(
+            api_key=key[0],
+            base_url=key[1],
+            http_client=http_client,
+            max_retries=0,
+            **kwargs,
+        )
+        _clients[key] = client
+    return client
+
+
+def client_for_config(config: AppConfig) -> anthropic.AsyncAnthropic:
+    """Return the shared client for an app config."""
+    return get_client(
+        config.api_key,
+        base_url=config.base_url,
+        timeout=config.request_timeout,
+        limits=PoolLimits.from_config(config),
+    )
+
+
+async def discard_client(
+    api_key: str | None = None,
+    *,
+    base_url: str | None = None,
+    timeout: float | None = None,
+) -> None:
+    """Close and forget one pooled client (e.g. after its key was rejected)."""
+    client = _clients.pop(_client_key(api_key, base_url, timeout), None)
+    if client is not None:
+        await client.close()
+
+
+async def close_clients() -> None:
+    """Close every pooled client and its connections."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
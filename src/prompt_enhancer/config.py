@@ -3,14 +3,25 @@
 API key is stored in ~/.prompt_enhancer/env as ANTHROPIC_API_KEY and loaded
 into the process environment. On load we also check the existing env var
 so users who export it in their shell profile don't need to configure it again.
+
+``load_config()`` is served from a process-wide ``ConfigService`` snapshot
+that is re-read only when either file's mtime or size changes. Saves update
+the snapshot and notify subscribers, so open screens can pick up new settings
+without reading the files themselves. The files are written behind the
+caller by ``persistence.get_writer()``.
 """
 
 from __future__ import annotations
 
 import os
+import threading
+from dataclasses import replace
 from pathlib import Path
+from typing import Callable
 
 from prompt_enhancer.models import AppConfig
+from prompt_enhancer.persistence import get_writer
+from prompt_enhancer.profiling import profiled_call
 
 CONFIG_DIR = Path.home() / ".prompt_enhancer"
 CONFIG_FILE = CONFIG_DIR / "config.json"
@@ -30,35 +41,144 @@ def _load_env_api_key() -> str:
     return os.environ.get("ANTHROPIC_API_KEY", "")
 
 
-def _save_env_api_key(api_key: str) -> None:
-    """Persist API key to ~/.prompt_enhancer/env and the current process."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    ENV_FILE.write_text(f"ANTHROPIC_API_KEY='{api_key}'\n")
-    ENV_FILE.chmod(0o600)
+def _write_env_api_key(api_key: str) -> None:
+    get_writer().write(ENV_FILE, f"ANTHROPIC_API_KEY='{api_key}'\n", mode=0o600)
     if api_key:
         os.environ["ANTHROPIC_API_KEY"] = api_key
 
 
-def load_config() -> AppConfig:
-    api_key = _load_env_api_key()
-    config = AppConfig(api_key=api_key)
+@profiled_call
+def _save_env_api_key(api_key: str) -> None:
+    """Persist API key to ~/.prompt_enhancer/env and the current process."""
+    _write_env_api_key(api_key)
+    _service.update(
+        replace(_service.get(), api_key=os.environ.get("ANTHROPIC_API_KEY", ""))
+    )
+
+
+def _load_saved_config() -> AppConfig:
+    """Read the non-secret settings from config.json, or defaults if absent."""
     if CONFIG_FILE.exists():
         try:
-            saved = AppConfig.from_json(CONFIG_FILE.read_text())
-            config.model = saved.model
-            config.max_tokens = saved.max_tokens
-        except (ValueError, KeyError):
+            return AppConfig.from_json(CONFIG_FILE.read_text())
+        except (ValueError, KeyError, TypeError):
             pass
+    return AppConfig()
+
+
+def _write_general_config(config: AppConfig) -> None:
+    non_secret = replace(config, api_key="")
+    get_writer().write(CONFIG_FILE, non_secret.to_json())
+
+
+def _read_config() -> AppConfig:
+    config = _load_saved_config()
+    config.api_key = _load_env_api_key()
     return config
 
 
-def save_general_config(model: str, max_tokens: int) -> None:
-    """Write only model and max_tokens to config.json (does not touch the env file)."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    non_secret = AppConfig(api_key="", model=model, max_tokens=max_tokens)
-    CONFIG_FILE.write_text(non_secret.to_json())
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ConfigService:
+    """Loads the config once and keeps an mtime-validated snapshot.
+
+    ``get()`` returns a copy of the snapshot, re-reading the files only if
+    config.json, the env file or ``ANTHROPIC_API_KEY`` changed. Saves hand
+    the new config to ``update()``, which notifies subscribers without
+    waiting for the write to reach disk.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._config: AppConfig | None = None
+        self._signature: tuple | None = None
+        self._subscribers: list[Callable[[AppConfig], None]] = []
+
+    def _current_signature(self) -> tuple:
+        return (
+            _file_signature(CONFIG_FILE),
+            _file_signature(ENV_FILE),
+            os.environ.get("ANTHROPIC_API_KEY", ""),
+        )
+
+    def _refresh(self) -> None:
+        with self._lock:
+            if self._config is not None:
+                pending = get_writer().pending_paths()
+                if CONFIG_FILE in pending or ENV_FILE in pending:
+                    # Our own save hasn't landed yet; the snapshot is newer.
+                    return
+                if self._current_signature() == self._signature:
+                    return
+            self._config = _read_config()
+            # Reading the env file may export the key; sign the state after.
+            self._signature = self._current_signature()
+
+    def get(self) -> AppConfig:
+        self._refresh()
+        return replace(self._config)
+
+    def update(self, config: AppConfig) -> None:
+        """Adopt a config this process just saved and notify subscribers."""
+        with self._lock:
+            changed = config != self._config
+            self._config = replace(config)
+            # Re-validated against the files once the queued writes land.
+            self._signature = None
+        if changed:
+            for callback in list(self._subscribers):
+                callback(replace(config))
+
+    def subscribe(self, callback: Callable[[AppConfig], None]) -> None:
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[AppConfig], None]) -> None:
+        try:
+            self._subscribers.remove(callback)
+        except ValueError:
+            pass
+
+
+_service = ConfigService()
+
+
+def get_config_service() -> ConfigService:
+    return _service
+
+
+@profiled_call
+def load_config() -> AppConfig:
+    return _service.get()
+
+
+@profiled_call
+def save_general_config(model: str, max_tokens: int, **options) -> None:
+    """Write non-secret settings to config.json (does not touch the env file).
+
+    Settings not passed in ``options`` keep their currently saved value.
+    """
+    config = _service.get()
+    config.model = model
+    config.max_tokens = max_tokens
+    for key, value in options.items():
+        if key == "api_key" or key not in AppConfig.__dataclass_fields__:
+            raise TypeError(f"Unknown config option: {key}")
+        setattr(config, key, value)
+    _write_general_config(config)
+    _service.update(config)
 
 
+@profiled_call
 def save_config(config: AppConfig) -> None:
-    _save_env_api_key(config.api_key)
-    save_general_config(config.model, config.max_tokens)
+    _write_env_api_key(config.api_key)
+    _write_general_config(config)
+    _service.update(
+        replace(config, api_key=os.environ.get("ANTHROPIC_API_KEY", ""))
+    )
@@ -0,0 +1,145 @@
+"""Precomputed fuzzy-match index for filter-as-you-type template search.
+
+Template names are matched as a subsequence of the query (so "cdrv" finds
+"Code Review") and ranked by how tight and how early the match is. The
+prompt fields are matched by substring and rank below every name match.
+Lowercased text is computed once per index and matching runs in the regex
+engine rather than a Python loop.
+
+Candidates are narrowed with bitsets (bit ``i`` for template ``i``) before
+any text is scanned. The regex only runs on names containing every
+character of the query, from a character index built up front. Field
+matches for each search term are kept, and a new term is only checked
+against the templates that matched the kept terms inside it: typing
+"review" checks "revi" against the matches for "rev". Indexing field
+bigrams up front instead would take seconds for a large library.
+"""
+
+from __future__ import annotations
+
+import re
+from itertools import compress, count
+
+from prompt_enhancer.models import Template
+
+_INDEX_MASK = (1 << 24) - 1
+_FIELDS = ("system_prompt", "domain_knowledge", "thinking_steps", "clarifying_instructions")
+# Field matches kept per index, oldest dropped first.
+MAX_KEPT_TERMS = 1024
+
+# Between 0/1 flag bytes and the binary digits of a bitset; bytes.translate
+# keeps the per-template work out of Python loops.
+_TO_DIGITS = bytes.maketrans(b"\0\1", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\0\1")
+
+
+def subsequence_pattern(query: str) -> re.Pattern:
+    """Compile ``query`` into a regex matching it as a subsequence.
+
+    Each gap is a negated character class (``c[^o]*o[^d]*d``), which matches
+    in linear time instead of backtracking like ``.*?`` would.
+    """
+    parts = [re.escape(query[0])]
+    for ch in query[1:]:
+        parts.append(f"[^{re.escape(ch)}]*{re.escape(ch)}")
+    return re.compile("".join(parts))
+
+
+def _bitset(flags: bytes | bytearray) -> int:
+    """Pack 0/1 ``flags`` into an int with bit ``i`` set where ``flags[i]`` is 1."""
+    return int(bytes(flags[::-1]).translate(_TO_DIGITS) or b"0", 2)
+
+
+def _members(bits: int) -> list[int]:
+    """The set bit positions of ``bits``, ascending."""
+    return list(compress(count(), bin(bits)[:1:-1].encode().translate(_FROM_DIGITS)))
+
+
+class FuzzyIndex:
+    def __init__(self, templates: list[Template]) -> None:
+        self.templates = templates
+        self._names = [t.name.lower() for t in templates]
+        self._fields = [
+            "\n".join(getattr(t, f) for f in _FIELDS).lower() for t in templates
+        ]
+        self._all = (1 << len(templates)) - 1
+        self._name_chars = {
+            ch: _bitset(bytes(ch in name for name in self._names))
+            for ch in set("".join(self._names))
+        }
+        self._field_terms: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def search(self, query: str) -> list[int]:
+        """Return indices into ``templates`` of matches, best first.
+
+        An empty query returns every template in its original order.
+        """
+        phrase = " ".join(query.lower().split())
+        if not phrase:
+            return list(range(len(self.templates)))
+
+        compact = phrase.replace(" ", "")
+        candidates = self._all
+        for ch in set(compact):
+            candidates &= self._name_chars.get(ch, 0)
+        pattern = subsequence_pattern(compact)
+        indices = _members(candidates)
+        names = map(self._names.__getitem__, indices)
+        ranked = []
+        for i, match in zip(indices, map(pattern.search, names)):
+            if match is not None:
+                # Tighter, then earlier, then original order; packed into one
+                # int because sorting ints is much cheaper than tuples.
+                start = match.start()
+                ranked.append((match.end() - start) << 48 | start << 24 | i)
+        ranked.sort()
+        hits = [key & _INDEX_MASK for key in ranked]
+
+        matches = self._all
+        for term in phrase.split():
+            matches &= self._field_matches(term)
+            if not matches:
+                break
+        named = set(hits)
+        hits += [i for i in _members(matches) if i not in named]
+        return hits
+
+    def update(self, i: int) -> None:
+        """Re-index ``templates[i]`` after it was edited in place."""
+        bit = 1 << i
+        for ch in set(self._names[i]):
+            self._name_chars[ch] &= ~bit
+        name = self._names[i] = self.templates[i].name.lower()
+        for ch in set(name):
+            self._name_chars[ch] = self._name_chars.get(ch, 0) | bit
+        fields = self._fields[i] = "\n".join(
+            getattr(self.templates[i], f) for f in _FIELDS
+        ).lower()
+        kept = self._field_terms
+        for term, matches in kept.items():
+            kept[term] = matches | bit if term in fields else matches & ~bit
+
+    def _field_matches(self, term: str) -> int:
+        """Templates whose fields contain ``term``, kept for later searches."""
+        kept = self._field_terms
+        matches = kept.get(term)
+        if matches is not None:
+            return matches
+        candidates = self._all
+        for other, other_matches in kept.items():
+            if other in term:
+                candidates &= other_matches
+        fields = self._fields
+        if candidates == self._all:
+            flags = bytes([term in f for f in fields])
+        else:
+            flags = bytearray(len(fields))
+            for i in [i for i in _members(candidates) if term in fields[i]]:
+                flags[i] = 1
+        if len(kept) >= MAX_KEPT_TERMS:
+            del kept[next(iter(kept))]
+        matches = kept[term] = _bitset(flags)
+        return matches
@@ -0,0 +1,204 @@
+"""Token-aware compaction of long enhancement conversations.
+
+Every refinement round adds to the message list that is resent on each turn.
+Once the history grows past a token budget, older turns are folded into a
+single condensed message: superseded ``<enhanced_prompt>`` drafts are
+dropped, earlier clarifying Q&A is summarized, and the newest folded draft
+is kept verbatim unless the recent messages hold a newer one. Compaction is
+deterministic and goes down to a low-water mark well under the budget, so
+the condensed prefix is reused, byte-identical (and prompt-cacheable), for
+many turns before the budget is exceeded again.
+"""
+
+from __future__ import annotations
+
+import re
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Compaction aims for this fraction of the budget, leaving the rest as room
+# to grow before the prefix has to change again.
+LOW_WATER = 0.5
+
+_ENHANCED_RE = re.compile(r"<enhanced_prompt>\s*(.*?)\s*</enhanced_prompt>", re.DOTALL)
+
+SUMMARY_HEADER = "[Earlier conversation, condensed to save context]"
+SUMMARY_ACK = "Understood. I'll continue from this context."
+
+
+def _text(message: dict) -> str:
+    content = message["content"]
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content)
+
+
+def estimate_tokens(message: dict) -> int:
+    """Rough token count for one message (about four characters per token)."""
+    return len(_text(message)) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def summarize(
+    messages: list[dict], max_exchange_chars: int = 0, keep_draft: bool = True
+) -> list[dict]:
+    """Condense ``messages`` (which must end with an assistant turn) into a
+    user/assistant pair.
+
+    With ``max_exchange_chars``, only the most recent Q&A exchanges that fit
+    are listed, so the summary stays bounded however long the session runs.
+    ``keep_draft=False`` leaves out the newest draft too, for when the
+    messages that follow the summary already contain a newer one.
+    """
+    lines = [SUMMARY_HEADER, "", "Original request:", _text(messages[0]).strip()]
+    exchanges: list[str] = []
+    drafts: list[str] = []
+    for i in range(1, len(messages), 2):
+        reply = _text(messages[i])
+        reply_drafts = _ENHANCED_RE.findall(reply)
+        drafts += reply_drafts
+        if i + 1 == len(messages):
+            break
+        answer = _shorten(_text(messages[i + 1]), 500)
+        if reply_drafts:
+            exchanges.append(f"- Requested change to the draft: {answer}")
+        else:
+            exchanges.append(f"- Q: {_shorten(reply, 300)}\n  A: {answer}")
+
+    if max_exchange_chars:
+        kept: list[str] = []
+        size = 0
+        for exchange in reversed(exchanges):
+            size += len(exchange)
+            if size > max_exchange_chars:
+                break
+            kept.append(exchange)
+        omitted = len(exchanges) - len(kept)
+        exchanges = kept[::-1]
+        if omitted:
+            exchanges.insert(0, f"- ({omitted} earlier exchange(s) omitted)")
+    if exchanges:
+        lines += ["", "Clarifying exchanges so far:", *exchanges]
+    if drafts and keep_draft:
+        # Later turns may revise it while this summary stays unchanged, so
+        # it isn't called the latest.
+        lines += [
+            "",
+            "Enhanced prompt at this point (verbatim; any later draft supersedes it):",
+            f"<enhanced_prompt>\n{drafts[-1]}\n</enhanced_prompt>",
+        ]
+        if len(drafts) > 1:
+            lines += [
+                "",
+                f"(Earlier draft(s): {len(drafts) - 1} superseded and omitted.)",
+            ]
+    elif drafts:
+        lines += [
+            "",
+            f"(Earlier draft(s): {len(drafts)} superseded and omitted; the current "
+            "draft is in the messages that follow.)",
+        ]
+    return [
+        {"role": "user", "content": "\n".join(lines)},
+        {"role": "assistant", "content": SUMMARY_ACK},
+    ]
+
+
+class HistoryCompactor:
+    """Keeps the messages sent to the API under ``budget`` estimated tokens.
+
+    ``compact`` never mutates the full history; it returns the list to send.
+    A budget of 0 disables compaction.
+    """
+
+    def __init__(self, budget: int, keep_recent: int = 4) -> None:
+        self.budget = budget
+        self.keep_recent = keep_recent
+        self._sizes: list[int] = []
+        self._cut = 0
+        self._boundary: dict | None = None
+        self._prefix: list[dict] = []
+        self._prefix_tokens = 0
+
+    @property
+    def compacted_messages(self) -> int:
+        """How many leading messages are currently folded into the summary."""
+        return self._cut
+
+    def _update_sizes(self, messages: list[dict]) -> None:
+        if len(messages) < len(self._sizes):
+            self._sizes = []  # history was rolled back or replaced
+        for message in messages[len(self._sizes) :]:
+            self._sizes.append(estimate_tokens(message))
+
+    def _reset(self) -> None:
+        self._cut = 0
+        self._boundary = None
+        self._prefix = []
+        self._prefix_tokens = 0
+
+    def compact(self, messages: list[dict]) -> list[dict]:
+        if self.budget <= 0:
+            return messages
+        self._update_sizes(messages)
+        if self._cut and (
+            len(messages) <= self._cut or messages[self._cut - 1] is not self._boundary
+        ):
+            self._reset()
+
+        tail_tokens = sum(self._sizes[self._cut :])
+        if self._prefix_tokens + tail_tokens > self.budget:
+            self._advance(messages)
+        if not self._cut:
+            return messages
+        return [*self._prefix, *messages[self._cut :]]
+
+    def _summarize(self, messages: list[dict], cut: int) -> list[dict]:
+        newer_draft = any(
+            _ENHANCED_RE.search(_text(m))
+            for m in messages[cut:]
+            if m["role"] == "assistant"
+        )
+        return summarize(
+            messages[:cut],
+            max_exchange_chars=self.budget // 8 * CHARS_PER_TOKEN,
+            keep_draft=not newer_draft,
+        )
+
+    def _advance(self, messages: list[dict]) -> None:
+        """Move the cut forward until summary plus tail fit under the
+        low-water mark (or only ``keep_recent`` messages are left).
+
+        Compacting well below the budget leaves room for many more turns
+        before the prefix has to change, which keeps it prompt-cacheable.
+        """
+        target = int(self.budget * LOW_WATER)
+        latest = len(messages) - self.keep_recent
+        cut = self._cut
+        tail_tokens = sum(self._sizes[cut:])
+        prefix: list[dict] | None = None
+        prefix_tokens = self._prefix_tokens
+        # The tail must start with a user message, so cut on even indices.
+        candidate = cut + 2
+        while candidate <= latest and prefix_tokens + tail_tokens > target:
+            tail_tokens -= self._sizes[candidate - 2] + self._sizes[candidate - 1]
+            cut = candidate
+            candidate += 2
+            if prefix_tokens + tail_tokens <= target or candidate > latest:
+                # Only summarize when the cut might stop here.
+                prefix = self._summarize(messages, cut)
+                prefix_tokens = sum(estimate_tokens(m) for m in prefix)
+        if cut == self._cut:
+            return
+        if prefix is None:
+            prefix = self._summarize(messages, cut)
+            prefix_tokens = sum(estimate_tokens(m) for m in prefix)
+        self._cut = cut
+        self._boundary = messages[cut - 1]
+        self._prefix = prefix
+        self._prefix_tokens = prefix_tokens
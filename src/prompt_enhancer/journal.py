@@ -0,0 +1,194 @@
+"""Append-only journal of enhancement sessions, for resuming them later.
+
+Each session gets one JSONL file under ``~/.prompt_enhancer/sessions/``,
+created on its first message. Records are short and never rewritten:
+
+- ``{"t": "start", "template": {...}, "at": ...}``: the template as used
+- ``{"t": "user", "text": ...}``: a user message
+- ``{"t": "part", "text": ...}``: streamed reply text since the last part,
+  checkpointed every ``CHECKPOINT_INTERVAL`` seconds while a reply streams
+- ``{"t": "done"}``: the parts since the last user message are a complete
+  reply
+- ``{"t": "abort"}``: the turn failed and was dropped
+
+A reply's text is stored once, as its parts, so replaying a journal is a
+single pass that joins strings. Lines go through the background writer, so
+the event loop never waits on disk; a crash loses at most the last
+checkpoint interval of a streaming reply.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from prompt_enhancer.models import Template
+from prompt_enhancer.persistence import get_writer
+
+JOURNAL_DIR = Path.home() / ".prompt_enhancer" / "sessions"
+
+CHECKPOINT_INTERVAL = 0.5
+
+
+def _line(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+class SessionJournal:
+    """Writes one session's records; the file appears with the first message."""
+
+    def __init__(self, template: Template, path: Path | None = None) -> None:
+        self.template = template
+        self.path = path or JOURNAL_DIR / (
+            time.strftime("%Y%m%d-%H%M%S") + f"-{uuid.uuid4().hex[:8]}.jsonl"
+        )
+        self._started = path is not None and path.exists()
+        self._parts: list[str] = []
+        self._last_checkpoint = 0.0
+
+    def _append(self, *records: dict) -> None:
+        if not self._started:
+            self._started = True
+            records = (
+                {"t": "start", "template": self.template.to_dict(), "at": time.time()},
+                *records,
+            )
+        get_writer().append(self.path, "".join(_line(r) for r in records))
+
+    def user(self, text: str) -> None:
+        self._parts.clear()
+        self._last_checkpoint = time.monotonic()
+        self._append({"t": "user", "text": text})
+
+    def chunk(self, text: str) -> None:
+        """Buffer streamed text, checkpointing it every ``CHECKPOINT_INTERVAL``."""
+        self._parts.append(text)
+        now = time.monotonic()
+        if now - self._last_checkpoint >= CHECKPOINT_INTERVAL:
+            self._last_checkpoint = now
+            self._append(self._take_part())
+
+    def _take_part(self) -> dict:
+        part = {"t": "part", "text": "".join(self._parts)}
+        self._parts.clear()
+        return part
+
+    def done(self) -> None:
+        records = [self._take_part()] if self._parts else []
+        self._append(*records, {"t": "done"})
+
+    def abort(self) -> None:
+        self._parts.clear()
+        self._append({"t": "abort"})
+
+
+@dataclass
+class JournalState:
+    """A session rebuilt from its journal."""
+
+    path: Path
+    template: Template
+    messages: list[dict] = field(default_factory=list)
+    # The last user message, if its reply never completed.
+    pending_user_text: str | None = None
+    partial_reply: str = ""
+
+
+def load_journal(path: Path) -> JournalState:
+    """Replay ``path`` into the completed turns plus any interrupted one."""
+    state: JournalState | None = None
+    user_text: str | None = None
+    parts: list[str] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line after a crash
+            kind = record.get("t")
+            if kind == "start":
+                state = JournalState(path, Template.from_dict(record["template"]))
+            elif kind == "user":
+                user_text, parts = record["text"], []
+            elif kind == "part":
+                parts.append(record["text"])
+            elif kind == "done" and user_text is not None and state is not None:
+                state.messages.append({"role": "user", "content": user_text})
+                state.messages.append({"role": "assistant", "content": "".join(parts)})
+                user_text, parts = None, []
+            elif kind == "abort":
+                user_text, parts = None, []
+    if state is None:
+        raise ValueError(f"{path} is not a session journal")
+    state.pending_user_text = user_text
+    state.partial_reply = "".join(parts) if user_text is not None else ""
+    return state
+
+
+@dataclass
+class JournalInfo:
+    path: Path
+    template_name: str
+    title: str
+    updated_at: float
+
+
+def _peek(path: Path) -> JournalInfo | None:
+    """Read just the start record and first message for listing."""
+    template_name, title = "", ""
+    try:
+        with open(path, encoding="utf-8") as f:
+            for _, line in zip(range(2), f):
+                record = json.loads(line)
+                if record.get("t") == "start":
+                    template_name = record["template"].get("name", "")
+                elif record.get("t") == "user":
+                    title = record["text"]
+        updated_at = path.stat().st_mtime
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+    if not title:
+        return None
+    return JournalInfo(path, template_name, title, updated_at)
+
+
+def list_journals(limit: int = 50, retention_days: float = 30.0) -> list[JournalInfo]:
+    """Journals with at least one message, newest first.
+
+    Journals untouched for more than ``retention_days`` (0 keeps them all)
+    are deleted along the way.
+    """
+    try:
+        entries = list(os.scandir(JOURNAL_DIR))
+    except FileNotFoundError:
+        return []
+    cutoff = time.time() - retention_days * 24 * 3600 if retention_days else None
+    candidates = []
+    for entry in entries:
+        if not entry.name.endswith(".jsonl"):
+            continue
+        try:
+            mtime = entry.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if cutoff is not None and mtime < cutoff:
+            get_writer().delete(Path(entry.path))
+            continue
+        candidates.append((mtime, Path(entry.path)))
+    candidates.sort(reverse=True)
+    journals = []
+    for _, path in candidates:
+        info = _peek(path)
+        if info is not None:
+            journals.append(info)
+            if len(journals) >= limit:
+                break
+    return journals
+
+
+def delete_journal(path: Path) -> None:
+    get_writer().delete(path)
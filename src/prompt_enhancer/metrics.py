@@ -0,0 +1,246 @@
+"""Per-request latency and token metrics, and a rotating JSONL log of them.
+
+Every API call is timed with a ``RequestTimer``: time to first token, total
+duration, output tokens per second and the token usage the API reported.
+Finished records go to any live subscribers (the readouts in the session and
+wizard screens) and, when ``config.metrics_log`` is on, are appended to
+``~/.prompt_enhancer/metrics.jsonl`` on a background thread. The log rotates
+past ``config.metrics_max_mb`` and keeps a few old files, which
+``read_records`` and ``summarize`` read back for p50/p95 figures.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from prompt_enhancer.models import AppConfig
+
+METRICS_FILE = Path.home() / ".prompt_enhancer" / "metrics.jsonl"
+
+# Rotated files kept next to the live one (metrics.jsonl.1 ... .3).
+_BACKUPS = 3
+
+
+@dataclass
+class RequestMetrics:
+    """Timing and token usage of one API request."""
+
+    kind: str  # "session", "suggestions" or "draft"
+    model: str
+    template_id: str = ""
+    phase: str = ""
+    started_at: float = 0.0
+    first_token_s: float | None = None
+    duration_s: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    replayed: bool = False
+    retries: int = 0
+    hedged: bool = False
+    error: str = ""
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        """Output tokens per second after the first token arrived."""
+        if self.first_token_s is None or not self.output_tokens:
+            return None
+        generating = self.duration_s - self.first_token_s
+        return self.output_tokens / generating if generating > 0 else None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "tokens_per_second": self.tokens_per_second}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RequestMetrics:
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+    def describe(self) -> str:
+        """One-line readout, e.g. ``TTFT 0.41s · 2.3s · 58 tok/s · 1,204 in / 340 out``."""
+        parts = []
+        if self.first_token_s is not None:
+            parts.append(f"TTFT {self.first_token_s:.2f}s")
+        parts.append(f"{self.duration_s:.1f}s")
+        if self.tokens_per_second is not None:
+            parts.append(f"{self.tokens_per_second:.0f} tok/s")
+        if self.input_tokens or self.output_tokens:
+            parts.append(f"{self.input_tokens:,} in / {self.output_tokens:,} out")
+        if self.cache_read_input_tokens:
+            parts.append(f"cache {self.cache_read_input_tokens:,} read")
+        if self.replayed:
+            parts.append("replayed")
+        if self.retries:
+            parts.append(f"{self.retries} {'retry' if self.retries == 1 else 'retries'}")
+        if self.hedged:
+            parts.append("hedged")
+        if self.error:
+            parts.append(f"failed: {self.error}")
+        return " · ".join(parts)
+
+
+class RequestTimer:
+    """Times one request: call ``token()`` per chunk, then ``finish()``."""
+
+    def __init__(
+        self, kind: str, model: str, template_id: str = "", phase: str = ""
+    ) -> None:
+        self.metrics = RequestMetrics(
+            kind=kind,
+            model=model,
+            template_id=template_id,
+            phase=phase,
+            started_at=time.time(),
+        )
+        self._start = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def token(self) -> None:
+        if self.metrics.first_token_s is None:
+            self.metrics.first_token_s = self.elapsed
+
+    def finish(
+        self, usage=None, *, replayed: bool = False, error: str = ""
+    ) -> RequestMetrics:
+        """Stamp the duration and copy counts from an SDK or ``TokenUsage`` usage."""
+        metrics = self.metrics
+        metrics.duration_s = self.elapsed
+        metrics.replayed = replayed
+        metrics.error = error
+        if usage is not None:
+            for name in (
+                "input_tokens",
+                "output_tokens",
+                "cache_creation_input_tokens",
+                "cache_read_input_tokens",
+            ):
+                setattr(metrics, name, getattr(usage, name, None) or 0)
+        return metrics
+
+
+_subscribers: list[Callable[[RequestMetrics], None]] = []
+
+
+def subscribe(callback: Callable[[RequestMetrics], None]) -> None:
+    """Call ``callback`` with every finished request (on the event loop)."""
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[RequestMetrics], None]) -> None:
+    try:
+        _subscribers.remove(callback)
+    except ValueError:
+        pass
+
+
+def record(config: AppConfig, metrics: RequestMetrics) -> None:
+    """Publish a finished request to subscribers and the metrics log."""
+    for callback in list(_subscribers):
+        callback(metrics)
+    if config.metrics_log:
+        get_metrics_log(config).append(metrics)
+
+
+class MetricsLog:
+    """Append-only JSONL file written by a background thread, size-rotated."""
+
+    def __init__(self, path: Path, max_bytes: int, backups: int = _BACKUPS) -> None:
+        import logging
+        import logging.handlers
+        import queue
+
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._make_record = logging.makeLogRecord
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(self._queue, handler)
+        self._listener.start()
+        self._closed = False
+        atexit.register(self.close)
+
+    def append(self, metrics: RequestMetrics) -> None:
+        line = json.dumps(metrics.to_dict(), separators=(",", ":"))
+        self._queue.put(self._make_record({"msg": line}))
+
+    def close(self) -> None:
+        """Write out queued records and stop the thread."""
+        if not self._closed:
+            self._closed = True
+            self._listener.stop()
+
+
+_log: MetricsLog | None = None
+
+
+def get_metrics_log(config: AppConfig) -> MetricsLog:
+    """Return the process-wide log at ``METRICS_FILE``."""
+    global _log
+    if _log is None:
+        _log = MetricsLog(METRICS_FILE, int(config.metrics_max_mb * 1024 * 1024))
+    return _log
+
+
+def read_records(path: Path = METRICS_FILE) -> list[RequestMetrics]:
+    """Read the log and its rotated backups, oldest first."""
+    records = []
+    files = [path.with_name(f"{path.name}.{i}") for i in range(_BACKUPS, 0, -1)]
+    for file in [*files, path]:
+        try:
+            lines = file.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            continue
+        for line in lines:
+            try:
+                records.append(RequestMetrics.from_dict(json.loads(line)))
+            except (ValueError, TypeError):
+                continue
+    return records
+
+
+def percentile(values: list[float], q: float) -> float:
+    """The ``q`` quantile (0-1) of a non-empty list of values."""
+    ordered = sorted(values)
+    # Nearest-rank: the smallest value with at least q of the values at or below it.
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(records: Iterable[RequestMetrics]) -> list[dict]:
+    """p50/p95 of TTFT, duration and tokens/s per (kind, model).
+
+    Replayed and failed requests are left out, since they say nothing about
+    API latency.
+    """
+    groups: dict[tuple[str, str], list[RequestMetrics]] = {}
+    for metrics in records:
+        if metrics.replayed or metrics.error:
+            continue
+        groups.setdefault((metrics.kind, metrics.model), []).append(metrics)
+
+    rows = []
+    for (kind, model), group in sorted(groups.items()):
+        row: dict = {"kind": kind, "model": model, "count": len(group)}
+        series = {
+            "ttft_s": [m.first_token_s for m in group if m.first_token_s is not None],
+            "duration_s": [m.duration_s for m in group],
+            "tokens_per_second": [
+                m.tokens_per_second for m in group if m.tokens_per_second is not None
+            ],
+        }
+        for name, values in series.items():
+            row[f"{name}_p50"] = percentile(values, 0.50) if values else None
+            row[f"{name}_p95"] = percentile(values, 0.95) if values else None
+        rows.append(row)
+    return rows
@@ -17,6 +17,8 @@ class Template:
     clarifying_instructions: str = ""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     builtin: bool = False
+    prompt_caching: bool = False
+    fast_model: str = ""
 
     def to_dict(self) -> dict:
         return asdict(self)
@@ -33,7 +35,9 @@ class Template:
         return cls.from_dict(json.loads(text))
 
     def save(self, path: Path) -> None:
-        path.write_text(self.to_json())
+        from prompt_enhancer.persistence import atomic_write_text
+
+        atomic_write_text(path, self.to_json())
 
     @classmethod
     def load(cls, path: Path) -> Template:
@@ -45,6 +49,36 @@ class AppConfig:
     api_key: str = ""
     model: str = "claude-sonnet-4-5-20250929"
     max_tokens: int = 4096
+    prompt_caching: bool = False
+    base_url: str = ""
+    request_timeout: float = 600.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    render_fps: int = 30
+    history_token_budget: int = 24000
+    template_store: str = "json"
+    wizard_prefetch: bool = True
+    prefetch_concurrency: int = 2
+    prefetch_budget: int = 3
+    suggestion_cache: bool = True
+    cache_max_mb: float = 50.0
+    cache_ttl_days: float = 7.0
+    response_cache: bool = False
+    replay_chars_per_second: float = 400.0
+    fast_model: str = ""
+    routing_question_turns: int = 2
+    metrics_log: bool = True
+    metrics_max_mb: float = 5.0
+    watchdog: bool = False
+    watchdog_stall_ms: float = 100.0
+    session_journal: bool = True
+    journal_retention_days: float = 30.0
+    max_retries: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    hedge_requests: bool = False
+    hedge_min_s: float = 1.0
 
     def to_dict(self) -> dict:
         return asdict(self)
@@ -0,0 +1,237 @@
+"""Atomic file writes and a write-behind queue for templates and config.
+
+Every file is written to a temp file in the same directory, fsynced and then
+renamed over the target, so a crash leaves either the old or the new
+contents, never a truncated file. UI code hands writes to a background
+thread instead of blocking the event loop; repeated saves of the same path
+that are still queued collapse into the latest one. Append-only files (the
+session journal) use ``append``, whose queued data is joined instead, and
+stores that aren't plain files (the SQLite template store) queue a ``call``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable
+
+_umask_value: int | None = None
+_umask_lock = threading.Lock()
+
+
+def _umask() -> int:
+    """The process umask, read once on first use.
+
+    Linux reports it in /proc without changing it. Elsewhere the only way to
+    read it is to set it and put it back, which briefly affects files other
+    threads create, so that is done at most once.
+    """
+    global _umask_value
+    with _umask_lock:
+        if _umask_value is None:
+            try:
+                with open("/proc/self/status", encoding="ascii") as f:
+                    _umask_value = next(
+                        int(line.split()[1], 8) for line in f if line.startswith("Umask:")
+                    )
+            except (OSError, StopIteration, ValueError, IndexError):
+                _umask_value = os.umask(0o077)
+                os.umask(_umask_value)
+        return _umask_value
+
+
+def atomic_write_text(path: Path, text: str, mode: int | None = None) -> None:
+    """Replace ``path`` with ``text`` via temp file + fsync + rename.
+
+    ``mode`` is applied to the temp file before the rename, so the target
+    never exists with looser permissions. Without it the file gets the same
+    permissions a plain ``write_text`` would have given it.
+    """
+    if mode is None:
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            # mkstemp creates files as 0600; write_text would give 0666 & ~umask.
+            mode = 0o666 & ~_umask()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    # Makes the rename itself durable; not supported on every platform.
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_DELETE = object()
+
+
+class _Append(str):
+    """Queued text to add to the end of a file."""
+
+
+class _Call:
+    """A queued function that writes ``path`` itself."""
+
+    def __init__(self, fn: Callable[[], None]) -> None:
+        self.fn = fn
+
+
+def _append_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _then_append(call: _Call, path: Path, text: str) -> Callable[[], None]:
+    def run() -> None:
+        call.fn()
+        _append_text(path, text)
+
+    return run
+
+
+class BackgroundWriter:
+    """Writes and deletes files on a daemon thread, coalesced per path.
+
+    ``write()``, ``append()``, ``delete()`` and ``call()`` return
+    immediately. A newer operation on a path replaces any queued one for it
+    (appends are added to a queued write or append instead), and
+    ``is_pending()`` lets readers tell that a file on disk is about to
+    change. Failures are kept in ``errors`` rather than raised, since the
+    caller has already moved on.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[Path, tuple[object, int | None]] = {}
+        self._busy: Path | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self.errors: list[tuple[Path, Exception]] = []
+        self.writes = 0
+        self.coalesced = 0
+
+    def write(self, path: Path, text: str, mode: int | None = None) -> None:
+        self._submit(path, text, mode)
+
+    def append(self, path: Path, text: str) -> None:
+        """Add ``text`` to the end of ``path`` (created if missing); not atomic."""
+        self._submit(path, _Append(text), None)
+
+    def delete(self, path: Path) -> None:
+        self._submit(path, _DELETE, None)
+
+    def call(self, path: Path, fn: Callable[[], None]) -> None:
+        """Run ``fn()``, which writes ``path``, on the writer thread."""
+        self._submit(path, _Call(fn), None)
+
+    def is_pending(self, path: Path) -> bool:
+        with self._cond:
+            return path in self._pending or path == self._busy
+
+    def pending_paths(self) -> set[Path]:
+        with self._cond:
+            paths = set(self._pending)
+            if self._busy is not None:
+                paths.add(self._busy)
+            return paths
+
+    def _submit(self, path: Path, data: object, mode: int | None) -> None:
+        with self._cond:
+            if path in self._pending:
+                self.coalesced += 1
+                # Re-queue at the end so operations stay in submission order.
+                queued, queued_mode = self._pending.pop(path)
+                if isinstance(data, _Append):
+                    if queued is _DELETE:
+                        data = str(data)  # delete, then append: a fresh file
+                    elif isinstance(queued, str):
+                        # Write + append stays a write; append + append, an append.
+                        data = type(queued)(queued + data)
+                        mode = queued_mode
+                    else:
+                        # A queued call has no text to join onto: run it,
+                        # then append.
+                        data = _Call(_then_append(queued, path, str(data)))
+            self._pending[path] = (data, mode)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="prompt-enhancer-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                path = next(iter(self._pending))
+                data, mode = self._pending.pop(path)
+                self._busy = path
+            try:
+                if data is _DELETE:
+                    path.unlink(missing_ok=True)
+                elif isinstance(data, _Call):
+                    data.fn()
+                    self.writes += 1
+                elif isinstance(data, _Append):
+                    _append_text(path, data)
+                    self.writes += 1
+                else:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    atomic_write_text(path, data, mode)
+                    self.writes += 1
+            except Exception as exc:  # e.g. OSError, or sqlite3.Error from a call
+                self.errors.append((path, exc))
+            finally:
+                with self._cond:
+                    self._busy = None
+                    self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued operation has finished (or ``timeout``)."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._busy is None, timeout
+            )
+
+
+_writer: BackgroundWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> BackgroundWriter:
+    """Return the process-wide writer, flushed automatically at exit."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter()
+            atexit.register(_writer.flush)
+        return _writer
@@ -0,0 +1,252 @@
+"""Opt-in cProfile hooks around screen workers and storage calls.
+
+Turn it on with ``PROMPT_ENHANCER_PROFILE=1`` or ``prompt-enhancer
+--profile``. Worker coroutines passed through ``profiled()`` are profiled one
+step at a time: the profiler runs only while the coroutine itself executes,
+not while it awaits, so time spent by other tasks on the event loop isn't
+charged to it. The longest single step per worker is recorded as well, since
+that is how long the UI was blocked. Functions decorated with
+``@profiled_call`` (template and config storage) are profiled per call.
+
+At exit each profile is written as a pstats file under
+``~/.prompt_enhancer/profiles/<timestamp>-<pid>/``, next to ``combined.pstats``
+and a ``summary.txt``. When profiling is off, ``profiled()`` returns its
+argument unchanged and decorated functions cost one global check per call.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Coroutine, TypeVar
+
+PROFILES_DIR = Path.home() / ".prompt_enhancer" / "profiles"
+ENV_VAR = "PROMPT_ENHANCER_PROFILE"
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Timing:
+    runs: int = 0
+    steps: int = 0
+    wall_s: float = 0.0
+    longest_step_s: float = 0.0
+
+
+class _Yield:
+    """Hands an object a coroutine yielded back to the event loop as-is."""
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __await__(self):
+        return (yield self.value)
+
+
+class SessionProfiler:
+    """Collects named cProfile profiles for one run of the app."""
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory or PROFILES_DIR / (
+            time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        )
+        self._idle: dict[str, list] = {}
+        self._all: dict[str, list] = {}
+        self._timings: dict[str, _Timing] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._dirty = False
+        self.skipped = 0
+
+    def _acquire(self, name: str):
+        """An idle profile for ``name``; each is only enabled on one thread."""
+        import cProfile
+
+        with self._lock:
+            idle = self._idle.setdefault(name, [])
+            if idle:
+                return idle.pop()
+            profile = cProfile.Profile()
+            self._all.setdefault(name, []).append(profile)
+            return profile
+
+    def _release(self, name: str, profile) -> None:
+        with self._lock:
+            self._idle[name].append(profile)
+
+    def _run(self, name: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call ``fn`` under the profile for ``name``, recording the step time."""
+        profile = None
+        if not getattr(self._local, "active", False):
+            # Inside a profiled step on this thread the outer profile already
+            # sees this call, and enabling a second one would stop it.
+            profile = self._acquire(name)
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler owns the interpreter (Python 3.12+ allows one).
+                self._release(name, profile)
+                profile = None
+                self.skipped += 1
+            else:
+                self._local.active = True
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self._local.active = False
+                self._release(name, profile)
+            with self._lock:
+                self._dirty = True
+                timing = self._timings.setdefault(name, _Timing())
+                timing.steps += 1
+                timing.longest_step_s = max(timing.longest_step_s, elapsed)
+
+    def _finish_run(self, name: str, wall_s: float) -> None:
+        with self._lock:
+            timing = self._timings.setdefault(name, _Timing())
+            timing.runs += 1
+            timing.wall_s += wall_s
+
+    async def profile_coroutine(self, name: str, coro: Coroutine[Any, Any, T]) -> T:
+        """Await ``coro``, profiling each step it runs on the event loop."""
+        start = time.perf_counter()
+        value: Any = None
+        error: BaseException | None = None
+        try:
+            while True:
+                try:
+                    if error is not None:
+                        yielded = self._run(name, coro.throw, error)
+                    else:
+                        yielded = self._run(name, coro.send, value)
+                except StopIteration as stop:
+                    return stop.value
+                try:
+                    value, error = await _Yield(yielded), None
+                except GeneratorExit:
+                    coro.close()
+                    raise
+                except BaseException as exc:  # cancellation goes to the worker
+                    value, error = None, exc
+        finally:
+            self._finish_run(name, time.perf_counter() - start)
+
+    def profile_call(self, name: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        start = time.perf_counter()
+        try:
+            return self._run(name, fn, *args, **kwargs)
+        finally:
+            self._finish_run(name, time.perf_counter() - start)
+
+    def dump(self) -> Path | None:
+        """Write the profiles collected so far; returns the directory, if any."""
+        import pstats
+
+        with self._lock:
+            if not self._dirty:
+                return self.directory if self.directory.exists() else None
+            self._dirty = False
+            collected = {
+                name: list(profiles) for name, profiles in self._all.items() if profiles
+            }
+            timings = dict(self._timings)
+        if not collected:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        combined = None
+        for name, profiles in collected.items():
+            try:
+                stats = pstats.Stats(*profiles)
+            except TypeError:  # every profile of this name was empty
+                continue
+            stats.dump_stats(self.directory / f"{_file_name(name)}.pstats")
+            if combined is None:
+                combined = stats
+            else:
+                combined.add(stats)
+        if combined is None:
+            return None
+        combined.dump_stats(self.directory / "combined.pstats")
+
+        with open(self.directory / "summary.txt", "w", encoding="utf-8") as out:
+            out.write(f"{'name':<48} {'runs':>6} {'steps':>7} {'wall s':>9} "
+                      f"{'longest step ms':>16}\n")
+            for name, timing in sorted(
+                timings.items(), key=lambda item: -item[1].longest_step_s
+            ):
+                out.write(
+                    f"{name:<48} {timing.runs:>6} {timing.steps:>7} "
+                    f"{timing.wall_s:>9.3f} {timing.longest_step_s * 1000:>16.1f}\n"
+                )
+            if self.skipped:
+                out.write(f"\n{self.skipped} calls not profiled (profiler busy)\n")
+            out.write("\n")
+            combined.stream = out
+            combined.sort_stats("cumulative").print_stats(40)
+        return self.directory
+
+
+def _file_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+
+
+_profiler: SessionProfiler | None = None
+
+
+def enable(directory: Path | None = None) -> SessionProfiler:
+    """Start profiling for the rest of the process; dumped at exit."""
+    global _profiler
+    if _profiler is None:
+        _profiler = SessionProfiler(directory)
+        atexit.register(_profiler.dump)
+    return _profiler
+
+
+def active() -> SessionProfiler | None:
+    return _profiler
+
+
+def profiled(work: T, name: str | None = None) -> T:
+    """Wrap a worker coroutine or callable for profiling, if it is on.
+
+    Returns ``work`` itself when profiling is off.
+    """
+    profiler = _profiler
+    if profiler is None:
+        return work
+    name = name or getattr(work, "__qualname__", None) or type(work).__name__
+    if hasattr(work, "send") and hasattr(work, "throw"):
+        return profiler.profile_coroutine(name, work)
+    if callable(work):
+        return functools.wraps(work)(
+            lambda *args, **kwargs: profiler.profile_call(name, work, *args, **kwargs)
+        )
+    return work
+
+
+def profiled_call(fn: Callable[..., T]) -> Callable[..., T]:
+    """Decorator: profile each call of ``fn`` while profiling is on."""
+    name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = _profiler
+        if profiler is None:
+            return fn(*args, **kwargs)
+        return profiler.profile_call(name, fn, *args, **kwargs)
+
+    return wrapper
+
+
+if os.environ.get(ENV_VAR, "").strip() not in ("", "0"):
+    enable()
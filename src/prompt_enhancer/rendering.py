@@ -0,0 +1,119 @@
+"""Frame-rate-limited rendering for streamed text.
+
+Streaming responses arrive one small chunk at a time. Redrawing a widget per
+chunk makes long responses stutter on slow terminals and over SSH, so chunks
+are buffered and redraws coalesced to a fixed frame rate instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Callable
+
+
+class TextBuffer:
+    """Append-only text buffer with cheap appends and tail reads."""
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, text: str) -> None:
+        if text:
+            self._chunks.append(text)
+            self._length += len(text)
+
+    def tail(self, n: int) -> str:
+        """Return the last ``n`` characters without joining the whole buffer."""
+        parts: list[str] = []
+        size = 0
+        for chunk in reversed(self._chunks):
+            parts.append(chunk)
+            size += len(chunk)
+            if size >= n:
+                break
+        text = "".join(reversed(parts))
+        return text[-n:] if len(text) > n else text
+
+    def getvalue(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+
+class FrameThrottle:
+    """Coalesces redraw requests into at most ``fps`` frames per second.
+
+    ``request()`` marks the view dirty; the ``render`` callback then runs
+    immediately if a frame is due, or once at the start of the next frame.
+    ``flush()`` renders any pending update right away (e.g. at stream end).
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], None],
+        fps: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._render_callback = render
+        self._interval = 1.0 / fps if fps > 0 else 0.0
+        self._clock = clock
+        self._timer: asyncio.TimerHandle | None = None
+        self._due = 0.0
+        self._last_frame = -math.inf
+        self._dirty = False
+        self.requests = 0
+        self.frames = 0
+        self.dropped_frames = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Update requests that were merged into another request's frame."""
+        return self.requests - self.frames
+
+    def request(self) -> None:
+        self.requests += 1
+        self._dirty = True
+        if self._timer is not None:
+            return
+        wait = self._last_frame + self._interval - self._clock()
+        if wait <= 0:
+            self._render()
+        else:
+            self._due = self._clock() + wait
+            self._timer = asyncio.get_running_loop().call_later(wait, self._on_timer)
+
+    def flush(self) -> None:
+        self._cancel_timer()
+        if self._dirty:
+            self._render()
+
+    def cancel(self) -> None:
+        """Drop any pending update without rendering it."""
+        self._cancel_timer()
+        self._dirty = False
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if self._interval:
+            # A busy event loop fires the timer late; count the frames it missed.
+            late = self._clock() - self._due
+            self.dropped_frames += int(late // self._interval)
+        if self._dirty:
+            self._render()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _render(self) -> None:
+        self._dirty = False
+        self._last_frame = self._clock()
+        self.frames += 1
+        self._render_callback()
@@ -0,0 +1,320 @@
+"""Retries with backoff, and hedged first tokens, for API calls.
+
+Pooled clients are created with the SDK's own retries off, so every request
+goes through here once: overloads (529), rate limits (429), 5xx responses
+and connection errors are retried up to ``config.max_retries`` times with
+jittered exponential backoff, waiting instead for the server's
+``retry-after`` when it sends one.
+
+A stream is only retried until its first text chunk arrives. After that the
+caller has already shown the text, so a failure is raised as-is and the
+caller rolls back the turn.
+
+With ``config.hedge_requests`` on, a stream that hasn't produced its first
+token by the p95 time to first token of recent requests (of the same kind
+and model, and at least ``config.hedge_min_s``) gets a second, identical
+request. Whichever answers first is kept and the other is closed. The
+samples come from the metrics: records from this process, seeded from
+``metrics.jsonl`` in a background thread the first time they're needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from prompt_enhancer.metrics import (
+    RequestMetrics,
+    RequestTimer,
+    percentile,
+    read_records,
+    subscribe,
+)
+from prompt_enhancer.models import AppConfig
+
+T = TypeVar("T")
+
+RETRY_STATUSES = frozenset({408, 409, 429})
+# Error types the API can also send as a mid-stream ``error`` event.
+RETRY_ERROR_TYPES = frozenset({"overloaded_error", "rate_limit_error", "api_error"})
+# Longest server-requested wait honored; beyond it our own backoff applies.
+MAX_RETRY_AFTER_S = 60.0
+
+# Time-to-first-token samples kept per (kind, model), and needed for a p95.
+_WINDOW = 100
+_MIN_SAMPLES = 10
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> RetryPolicy:
+        return cls(
+            max_retries=config.max_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+        )
+
+    def delay(self, attempt: int, exc: BaseException | None = None) -> float:
+        """Seconds to wait before retry ``attempt`` (0 for the first retry)."""
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return retry_after
+        # Half fixed, half random, so clients that failed together spread out
+        # without any of them retrying immediately.
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _retry_after(exc: BaseException | None) -> float | None:
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    seconds = None
+    try:
+        seconds = float(headers.get("retry-after-ms", "")) / 1000
+    except ValueError:
+        raw = headers.get("retry-after", "")
+        try:
+            seconds = float(raw)
+        except ValueError:
+            try:
+                seconds = email.utils.parsedate_to_datetime(raw).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+    if seconds is not None and 0 <= seconds <= MAX_RETRY_AFTER_S:
+        return seconds
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether ``exc`` is a transient API failure worth another attempt."""
+    response = getattr(exc, "response", None)
+    if response is not None:
+        should_retry = response.headers.get("x-should-retry")
+        if should_retry in ("true", "false"):
+            return should_retry == "true"
+
+    import anthropic
+
+    if isinstance(exc, anthropic.APIConnectionError):  # includes timeouts
+        return True
+    if isinstance(exc, anthropic.APIStatusError):
+        if exc.status_code in RETRY_STATUSES or exc.status_code >= 500:
+            return True
+        if exc.status_code >= 400:
+            return False
+        # An ``error`` event in a stream that started with a 200.
+        body = exc.body if isinstance(exc.body, dict) else {}
+        error = body.get("error")
+        return isinstance(error, dict) and error.get("type") in RETRY_ERROR_TYPES
+    return False
+
+
+async def call_with_retries(
+    call: Callable[[], Awaitable[T]], policy: RetryPolicy
+) -> T:
+    """Await ``call()``, calling it again after transient failures."""
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as exc:
+            if attempt >= policy.max_retries or not is_retryable(exc):
+                raise
+            await asyncio.sleep(policy.delay(attempt, exc))
+            attempt += 1
+
+
+class FirstTokenStats:
+    """Recent times to first token per (kind, model), for hedge thresholds."""
+
+    def __init__(self) -> None:
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+        self._loading: asyncio.Task | None = None
+
+    def observe(self, metrics: RequestMetrics) -> None:
+        # Retried and failed requests measure outages, not latency.
+        if (
+            metrics.first_token_s is None
+            or metrics.replayed
+            or metrics.error
+            or metrics.retries
+        ):
+            return
+        key = (metrics.kind, metrics.model)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=_WINDOW)
+        samples.append(metrics.first_token_s)
+
+    def p95(self, kind: str, model: str) -> float | None:
+        samples = self._samples.get((kind, model))
+        if samples is None or len(samples) < _MIN_SAMPLES:
+            return None
+        return percentile(list(samples), 0.95)
+
+    def load_history(self) -> None:
+        """Seed from the metrics log in a thread; call on the event loop."""
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._load())
+
+    async def _load(self) -> None:
+        try:
+            records = await asyncio.to_thread(read_records)
+        except OSError:
+            return
+        # Logged samples go in front of the ones observed since startup.
+        current, self._samples = self._samples, {}
+        for metrics in records:
+            self.observe(metrics)
+        for key, samples in current.items():
+            self._samples.setdefault(key, deque(maxlen=_WINDOW)).extend(samples)
+
+
+_first_tokens = FirstTokenStats()
+subscribe(_first_tokens.observe)
+
+
+def hedge_delay(config: AppConfig, kind: str, model: str) -> float | None:
+    """Seconds to wait for a first token before hedging; None to not hedge."""
+    if not config.hedge_requests:
+        return None
+    if config.metrics_log:
+        _first_tokens.load_history()
+    p95 = _first_tokens.p95(kind, model)
+    if p95 is None:
+        return None
+    return max(config.hedge_min_s, p95)
+
+
+class ResilientStream:
+    """One streamed Messages request, with retries and an optional hedge.
+
+    Used like the SDK's ``client.messages.stream(...)``: entering it waits
+    for the first token (retrying and hedging as needed), then
+    ``text_stream`` and ``get_final_message()`` work as usual. Retries and
+    hedging are counted on ``timer.metrics``.
+    """
+
+    def __init__(
+        self,
+        client,
+        params: dict,
+        policy: RetryPolicy,
+        timer: RequestTimer,
+        hedge_after: float | None = None,
+    ) -> None:
+        self.client = client
+        self.params = params
+        self.policy = policy
+        self.timer = timer
+        self.hedge_after = hedge_after
+        self.text_stream: AsyncIterator[str] | None = None
+        self._stream: Any = None
+
+    async def __aenter__(self) -> ResilientStream:
+        self._stream, chunks, first = await self._connect()
+        self.text_stream = _prepend(first, chunks)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._stream.close()
+
+    async def get_final_message(self):
+        return await self._stream.get_final_message()
+
+    async def _connect(self):
+        attempt = 0
+        while True:
+            try:
+                if self.hedge_after is None:
+                    return await self._open()
+                return await self._race()
+            except Exception as exc:
+                if attempt >= self.policy.max_retries or not is_retryable(exc):
+                    raise
+                await asyncio.sleep(self.policy.delay(attempt, exc))
+                attempt += 1
+                self.timer.metrics.retries = attempt
+
+    async def _open(self):
+        """Start a request and wait for its first text chunk (None if empty)."""
+        stream = await self.client.messages.stream(**self.params).__aenter__()
+        try:
+            chunks = stream.text_stream.__aiter__()
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = None
+        except BaseException:
+            await stream.close()
+            raise
+        return stream, chunks, first
+
+    async def _race(self):
+        """``_open()``, plus a second request if the first is slow to answer."""
+        tasks = [asyncio.ensure_future(self._open())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if not done:
+                self.timer.metrics.hedged = True
+                tasks.append(asyncio.ensure_future(self._open()))
+            winner = error = None
+            pending = set(tasks)
+            while winner is None and pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        break
+                    error = task.exception()
+            if winner is None:
+                raise error
+        except BaseException:
+            await _discard(tasks)
+            raise
+        await _discard([task for task in tasks if task is not winner])
+        return winner.result()
+
+
+async def _prepend(first: str | None, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    if first is None:
+        return
+    yield first
+    async for text in chunks:
+        yield text
+
+
+async def _discard(tasks: list[asyncio.Future]) -> None:
+    """Cancel the losing attempts and close any stream one already opened."""
+    for task in tasks:
+        task.cancel()
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, tuple):
+            await result[0].close()
+
+
+def resilient_stream(
+    config: AppConfig, client, params: dict, timer: RequestTimer
+) -> ResilientStream:
+    """A ``ResilientStream`` with the retry and hedge settings of ``config``."""
+    return ResilientStream(
+        client,
+        params,
+        RetryPolicy.from_config(config),
+        timer,
+        hedge_after=hedge_delay(config, timer.metrics.kind, params["model"]),
+    )
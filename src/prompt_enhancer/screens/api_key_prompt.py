@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-import anthropic
+from dataclasses import replace
+
 from textual.app import ComposeResult
 from textual.screen import ModalScreen
 from textual.widgets import Static, Button, Input
 from textual.containers import Vertical
 
+from prompt_enhancer.clients import client_for_config, discard_client
+from prompt_enhancer.resilience import RetryPolicy, call_with_retries
+from prompt_enhancer.config import load_config
+from prompt_enhancer.profiling import profiled
+
 
 class ApiKeyPromptScreen(ModalScreen[str]):
     """Blocks until the user provides a valid API key."""
@@ -44,7 +50,7 @@ class ApiKeyPromptScreen(ModalScreen[str]):
         if not api_key:
             self._set_status("Please enter an API key.", error=True)
             return
-        self.run_worker(self._validate_key(api_key), exclusive=True)
+        self.run_worker(profiled(self._validate_key(api_key)), exclusive=True)
 
     async def _validate_key(self, api_key: str) -> None:
         status = self.query_one("#api-key-prompt-status", Static)
@@ -53,15 +59,26 @@ class ApiKeyPromptScreen(ModalScreen[str]):
         btn.label = "Validating..."
         status.update("[dim]Checking API key...[/dim]")
 
+        # Validate through the same pooled client the sessions will use, so
+        # the first enhancement request starts on a warm connection.
+        import anthropic
+
+        config = replace(load_config(), api_key=api_key)
         try:
-            client = anthropic.AsyncAnthropic(api_key=api_key)
-            await client.messages.create(
-                model="claude-haiku-4-5-20251001",
-                max_tokens=1,
-                messages=[{"role": "user", "content": "hi"}],
+            client = client_for_config(config)
+            await call_with_retries(
+                lambda: client.messages.create(
+                    model="claude-haiku-4-5-20251001",
+                    max_tokens=1,
+                    messages=[{"role": "user", "content": "hi"}],
+                ),
+                RetryPolicy.from_config(config),
             )
             self.dismiss(api_key)
         except anthropic.AuthenticationError:
+            await discard_client(
+                api_key, base_url=config.base_url, timeout=config.request_timeout
+            )
             self._set_status("Invalid API key. Please check and try again.", error=True)
         except Exception as e:
             self._set_status(f"Connection error: {e}", error=True)
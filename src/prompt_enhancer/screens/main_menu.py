@@ -21,6 +21,7 @@ class MainMenuScreen(Screen):
                     id="menu-subtitle",
                 )
                 yield Button("Enhance a Prompt", id="btn-enhance", variant="primary")
+                yield Button("Resume Session", id="btn-resume", variant="default")
                 yield Button("Manage Templates", id="btn-templates", variant="default")
                 yield Button("Settings", id="btn-settings", variant="default")
         yield Footer()
@@ -30,6 +31,10 @@ class MainMenuScreen(Screen):
             from prompt_enhancer.screens.template_list import TemplateListScreen
 
             self.app.push_screen(TemplateListScreen(mode="select"))
+        elif event.button.id == "btn-resume":
+            from prompt_enhancer.screens.resume_list import ResumeSessionScreen
+
+            self.app.push_screen(ResumeSessionScreen())
         elif event.button.id == "btn-templates":
             from prompt_enhancer.screens.template_list import TemplateListScreen
 
@@ -0,0 +1,113 @@
+"""Resume screen listing journaled sessions, newest first."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.widgets import Header, Footer, Static, OptionList
+from textual.widgets.option_list import Option
+from textual.containers import Vertical
+from textual.content import Content
+
+from prompt_enhancer.journal import delete_journal, list_journals, load_journal
+
+TITLE_CHARS = 70
+
+
+def _age(timestamp: float) -> str:
+    seconds = max(0, time.time() - timestamp)
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}h ago"
+    return f"{int(seconds // 86400)}d ago"
+
+
+class ResumeSessionScreen(Screen):
+    BINDINGS = [
+        ("escape", "go_back", "Back"),
+        ("d", "delete_session", "Delete"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        with Vertical(id="resume-container"):
+            yield Static("Resume a Session", id="resume-title")
+            yield Static("", id="resume-status")
+            yield OptionList(id="resume-option-list")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self._refresh_list()
+        self.query_one("#resume-option-list", OptionList).focus()
+
+    def on_screen_resume(self) -> None:
+        self._refresh_list()
+
+    def _refresh_list(self) -> None:
+        from prompt_enhancer.config import load_config
+
+        journals = list_journals(retention_days=load_config().journal_retention_days)
+        option_list = self.query_one("#resume-option-list", OptionList)
+        option_list.clear_options()
+        options = []
+        for info in journals:
+            title = " ".join(info.title.split())
+            if len(title) > TITLE_CHARS:
+                title = title[: TITLE_CHARS - 1] + "…"
+            # Assembled rather than markup: titles are raw user text.
+            label = Content.assemble(
+                title, "  ", (f"{info.template_name} · {_age(info.updated_at)}", "dim")
+            )
+            options.append(Option(label, id=str(info.path)))
+        option_list.add_options(options)
+        if options:
+            option_list.highlighted = 0
+        self.query_one("#resume-status", Static).update(
+            f"{len(options)} session{'s' if len(options) != 1 else ''} · "
+            "Enter to resume, d to delete"
+            if options
+            else "No sessions to resume yet."
+        )
+
+    def on_option_list_option_selected(
+        self, event: OptionList.OptionSelected
+    ) -> None:
+        self._resume(Path(event.option.id))
+
+    def _resume(self, path: Path) -> None:
+        from prompt_enhancer.config import load_config
+
+        config = load_config()
+        if not config.api_key:
+            self.notify("Please set your API key in Settings first.", severity="error")
+            from prompt_enhancer.screens.settings import SettingsScreen
+
+            self.app.push_screen(SettingsScreen())
+            return
+
+        try:
+            state = load_journal(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.notify(f"Could not read session: {e}", severity="error")
+            return
+
+        from prompt_enhancer.screens.session import SessionScreen
+
+        self.app.push_screen(SessionScreen(state.template, config, resume=state))
+
+    def action_delete_session(self) -> None:
+        option = self.query_one("#resume-option-list", OptionList).highlighted_option
+        if option is None:
+            return
+        delete_journal(Path(option.id))
+        # The delete is queued; drop the row now rather than re-scanning.
+        option_list = self.query_one("#resume-option-list", OptionList)
+        option_list.remove_option(option.id)
+        self.notify("Session deleted.")
+
+    def action_go_back(self) -> None:
+        self.app.pop_screen()
@@ -2,15 +2,36 @@
 
 from __future__ import annotations
 
-import pyperclip
+import re
+
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Static, Button, Input, RichLog, TextArea
 from textual.containers import Vertical
+from textual.content import Content
+from textual.markup import escape
 
 from prompt_enhancer.models import Template, AppConfig
-from prompt_enhancer.api import EnhancementSession
+from prompt_enhancer.api import EnhancementSession, find_enhanced_prompt
+from prompt_enhancer.journal import JournalState, SessionJournal
+from prompt_enhancer.profiling import profiled
+from prompt_enhancer.rendering import FrameThrottle, TextBuffer
+from prompt_enhancer.tag_stream import TEXT, START, DELTA, END
+
+_PROMPT_BLOCK = re.compile(r"<enhanced_prompt>.*?(?:</enhanced_prompt>|$)", re.DOTALL)
+PROMPT_MARKER = "\n[dim](enhanced prompt below)[/dim]\n"
+
+
+def _log_reply(text: str, prompt_offsets: list[int]) -> str:
+    """Escape model text for the log, with a marker where each prompt was."""
+    pieces = []
+    start = 0
+    for offset in prompt_offsets:
+        pieces.append(escape(text[start:offset]))
+        start = offset
+    pieces.append(escape(text[start:]))
+    return PROMPT_MARKER.join(pieces).strip()
 
 
 class SessionScreen(Screen):
@@ -19,14 +40,28 @@ class SessionScreen(Screen):
         Binding("ctrl+y", "copy_to_clipboard", "Copy Prompt", show=True),
     ]
 
-    def __init__(self, template: Template, config: AppConfig) -> None:
+    def __init__(
+        self,
+        template: Template,
+        config: AppConfig,
+        resume: JournalState | None = None,
+    ) -> None:
         super().__init__()
         self.template = template
         self.config = config
-        self.session = EnhancementSession(template, config)
+        self.resume = resume
+        journal = (
+            SessionJournal(template, path=resume.path if resume else None)
+            if config.session_journal
+            else None
+        )
+        self.session = EnhancementSession(template, config, journal=journal)
+        if resume is not None:
+            self.session.restore(resume.messages)
         self._streaming = False
         self._enhanced_prompt: str | None = None
         self._first_response_received = False
+        self._render_throttle: FrameThrottle | None = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -34,6 +69,7 @@ class SessionScreen(Screen):
             yield Static(
                 f"Enhancing with: {self.template.name}", id="session-title"
             )
+            yield Static("", id="session-metrics")
             yield Static(
                 "Describe the prompt you want to create",
                 id="session-welcome",
@@ -58,8 +94,78 @@ class SessionScreen(Screen):
         yield Footer()
 
     def on_mount(self) -> None:
+        from prompt_enhancer.config import get_config_service
+
+        get_config_service().subscribe(self._on_config_changed)
+        if self.resume is not None:
+            self._show_resumed(self.resume)
         self.query_one("#session-input", Input).focus()
 
+    def _show_resumed(self, resume: JournalState) -> None:
+        """Replay a journaled conversation into the log and prompt display."""
+        input_widget = self.query_one("#session-input", Input)
+        log = self.query_one("#conversation-log", RichLog)
+        if resume.messages or resume.pending_user_text:
+            self.query_one("#session-welcome").add_class("hidden")
+            log.remove_class("hidden")
+        if resume.messages:
+            for message in resume.messages:
+                if message["role"] == "user":
+                    log.write(
+                        f"\n[bold cyan]You:[/bold cyan] {escape(message['content'])}"
+                    )
+                else:
+                    pieces = _PROMPT_BLOCK.split(message["content"])
+                    text = PROMPT_MARKER.join(escape(piece) for piece in pieces)
+                    log.write(f"[bold green]Assistant:[/bold green] {text.strip()}")
+            self._first_response_received = True
+            input_widget.placeholder = "Answer the question above..."
+
+        enhanced = self.session.extract_enhanced_prompt()
+        if resume.pending_user_text:
+            # Shown for reference only; the session resends the message.
+            log.write(
+                f"\n[bold cyan]You:[/bold cyan] {escape(resume.pending_user_text)}"
+            )
+            if resume.partial_reply:
+                pieces = _PROMPT_BLOCK.split(resume.partial_reply)
+                text = PROMPT_MARKER.join(escape(piece) for piece in pieces)
+                log.write(
+                    f"[bold green]Assistant:[/bold green] {text.strip()} "
+                    "[dim](interrupted)[/dim]"
+                )
+                # A prompt that finished before the interruption is still usable.
+                enhanced = find_enhanced_prompt(resume.partial_reply) or enhanced
+        if enhanced is None:
+            for message in reversed(resume.messages):
+                if message["role"] == "assistant":
+                    enhanced = find_enhanced_prompt(message["content"])
+                    if enhanced is not None:
+                        break
+        if enhanced:
+            self._enhanced_prompt = enhanced
+            self.query_one("#enhanced-section").remove_class("hidden")
+            self.query_one("#enhanced-prompt-display", TextArea).load_text(enhanced)
+            self.query_one("#btn-copy", Button).disabled = False
+            input_widget.placeholder = "Request changes, or press Escape to go back"
+
+        if resume.pending_user_text:
+            input_widget.value = resume.pending_user_text
+            self.notify(
+                "The last reply was interrupted; what arrived is shown above. "
+                "Press Enter to send your message again."
+            )
+
+    def on_unmount(self) -> None:
+        from prompt_enhancer.config import get_config_service
+
+        get_config_service().unsubscribe(self._on_config_changed)
+
+    def _on_config_changed(self, config: AppConfig) -> None:
+        # Takes effect from the next turn; a response in flight keeps its settings.
+        self.config = config
+        self.session.update_config(config)
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.input.id == "session-input":
             self._handle_send()
@@ -81,7 +187,7 @@ class SessionScreen(Screen):
         self.query_one("#session-welcome").add_class("hidden")
         self.query_one("#conversation-log").remove_class("hidden")
 
-        self.run_worker(self._stream_response(text), exclusive=True)
+        self.run_worker(profiled(self._stream_response(text)), exclusive=True)
 
     async def _stream_response(self, user_text: str) -> None:
         self._streaming = True
@@ -91,27 +197,65 @@ class SessionScreen(Screen):
         log = self.query_one("#conversation-log", RichLog)
         indicator = self.query_one("#streaming-indicator", Static)
 
-        log.write(f"\n[bold cyan]You:[/bold cyan] {user_text}")
+        log.write(f"\n[bold cyan]You:[/bold cyan] {escape(user_text)}")
         indicator.update("[bold yellow]Assistant is typing...[/bold yellow]")
+        readout_timer = self.set_interval(0.2, self._show_metrics)
 
-        response_text = ""
+        display = self.query_one("#enhanced-prompt-display", TextArea)
+        copy_btn = self.query_one("#btn-copy", Button)
+        # Plain model text; markup is only added when it is displayed.
+        conversation = TextBuffer()
+        prompt_offsets: list[int] = []
+        pending_prompt: list[str] = []
+        previewed = 0
+
+        def render_frame() -> None:
+            nonlocal previewed
+            if len(conversation) != previewed:
+                previewed = len(conversation)
+                # Styled rather than markup: a cut-off tail can end in "[/".
+                indicator.update(Content.styled(conversation.tail(200), "dim"))
+            if pending_prompt:
+                display.insert("".join(pending_prompt), display.document.end)
+                pending_prompt.clear()
+
+        throttle = FrameThrottle(render_frame, fps=self.config.render_fps)
+        self._render_throttle = throttle
         try:
-            async for chunk in self.session.send_message(user_text):
-                response_text += chunk
-                preview = response_text[-200:] if len(response_text) > 200 else response_text
-                indicator.update(f"[dim]{preview}[/dim]")
+            # Conversational text previews in the indicator and goes to the
+            # log; <enhanced_prompt> contents stream straight into the display.
+            # Both are buffered and redrawn at most once per frame.
+            async for event in self.session.stream_events(user_text):
+                if event.kind == TEXT:
+                    conversation.append(event.text)
+                    throttle.request()
+                elif event.kind == START:
+                    throttle.flush()
+                    prompt_offsets.append(len(conversation))
+                    indicator.update("[bold yellow]Writing enhanced prompt...[/bold yellow]")
+                    self.query_one("#enhanced-section").remove_class("hidden")
+                    display.load_text("")
+                    copy_btn.disabled = True
+                elif event.kind == DELTA:
+                    pending_prompt.append(event.text)
+                    throttle.request()
+                elif event.kind == END:
+                    throttle.flush()
+                    self._enhanced_prompt = event.text
+            throttle.flush()
 
             indicator.update("")
-            log.write(f"[bold green]Assistant:[/bold green] {response_text}")
+            log.write(
+                "[bold green]Assistant:[/bold green] "
+                + _log_reply(conversation.getvalue(), prompt_offsets)
+            )
 
             # Check for enhanced prompt
             enhanced = self.session.extract_enhanced_prompt()
             if enhanced:
                 self._enhanced_prompt = enhanced
-                self.query_one("#enhanced-section").remove_class("hidden")
-                display = self.query_one("#enhanced-prompt-display", TextArea)
-                display.load_text(enhanced)
-                copy_btn = self.query_one("#btn-copy", Button)
+                if display.text != enhanced:
+                    display.load_text(enhanced)
                 copy_btn.disabled = False
                 input_widget.placeholder = "Request changes, or press Escape to go back"
                 self.notify(
@@ -121,7 +265,15 @@ class SessionScreen(Screen):
                 self._first_response_received = True
                 input_widget.placeholder = "Answer the question above..."
         except Exception as e:
+            throttle.cancel()
             indicator.update("")
+            # Don't leave a half-streamed prompt in place of the last good one.
+            if self._enhanced_prompt and display.text != self._enhanced_prompt:
+                display.load_text(self._enhanced_prompt)
+            copy_btn.disabled = self._enhanced_prompt is None
+            # The session dropped the turn; put the message back to resend.
+            if not input_widget.value:
+                input_widget.value = user_text
             error_msg = str(e)
             if (
                 "authentication" in error_msg.lower()
@@ -132,14 +284,38 @@ class SessionScreen(Screen):
                     "Please check Settings."
                 )
             else:
-                log.write(f"[bold red]Error:[/bold red] {error_msg}")
+                log.write(f"[bold red]Error:[/bold red] {escape(error_msg)}")
+            log.write("[dim]Your message was not sent; press Enter to try again.[/dim]")
         finally:
+            readout_timer.stop()
+            self._show_metrics()
             self._streaming = False
             input_widget.disabled = False
             input_widget.focus()
 
+    def _show_metrics(self) -> None:
+        """Live readout of the turn in flight, or the last finished turn."""
+        readout = self.query_one("#session-metrics", Static)
+        timer = self.session.in_flight
+        if timer is not None:
+            metrics = timer.metrics
+            parts = [metrics.model]
+            if metrics.retries:
+                parts.append(f"retry {metrics.retries}")
+            if metrics.hedged:
+                parts.append("hedged")
+            if metrics.first_token_s is not None:
+                parts.append(f"TTFT {metrics.first_token_s:.2f}s")
+            parts.append(f"{timer.elapsed:.1f}s")
+            readout.update(" · ".join(parts))
+        elif self.session.last_metrics is not None:
+            metrics = self.session.last_metrics
+            readout.update(f"{metrics.model} · {metrics.describe()}")
+
     def _copy_to_clipboard(self) -> None:
         if self._enhanced_prompt:
+            import pyperclip
+
             try:
                 pyperclip.copy(self._enhanced_prompt)
                 self.notify("Copied to clipboard!")
@@ -2,7 +2,7 @@
 
 from textual.app import ComposeResult
 from textual.screen import Screen
-from textual.widgets import Header, Footer, Static, Button, Input, Select
+from textual.widgets import Header, Footer, Static, Button, Input, Select, Switch
 from textual.containers import Horizontal, Vertical
 
 from prompt_enhancer.config import (
@@ -17,6 +17,17 @@ MODELS = [
     ("Claude Opus 4.6", "claude-opus-4-6"),
 ]
 
+# "" keeps every turn on the main model.
+FAST_MODELS = [("Off (main model for every turn)", ""), *MODELS]
+
+
+def _fast_model_options(current: str) -> list[tuple[str, str]]:
+    """``FAST_MODELS``, plus ``current`` if config.json names another model."""
+    if current in {val for _, val in FAST_MODELS}:
+        return FAST_MODELS
+    # Listed so that saving other settings doesn't silently turn it off.
+    return [*FAST_MODELS, (f"{current} (from config.json)", current)]
+
 
 class SettingsScreen(Screen):
     BINDINGS = [
@@ -56,6 +67,13 @@ class SettingsScreen(Screen):
                         value=self._config.model,
                         id="select-model",
                     )
+                    yield Static("Fast model for clarifying questions", classes="field-label")
+                    yield Select(
+                        _fast_model_options(self._config.fast_model),
+                        value=self._config.fast_model,
+                        allow_blank=False,
+                        id="select-fast-model",
+                    )
                     yield Static("Max Tokens", classes="field-label")
                     yield Input(
                         value=str(self._config.max_tokens),
@@ -63,6 +81,15 @@ class SettingsScreen(Screen):
                         id="input-max-tokens",
                         type="integer",
                     )
+                    with Horizontal(classes="settings-switch-row"):
+                        yield Switch(
+                            value=self._config.prompt_caching,
+                            id="switch-prompt-caching",
+                        )
+                        yield Static(
+                            "Prompt caching (all templates)",
+                            classes="switch-label",
+                        )
                     with Horizontal(id="settings-general-buttons"):
                         yield Button("Save", id="btn-save-general", variant="primary")
         yield Footer()
@@ -93,7 +120,14 @@ class SettingsScreen(Screen):
             self.notify("Max tokens must be positive.", severity="error")
             return
 
-        save_general_config(model, max_tokens)
+        prompt_caching = self.query_one("#switch-prompt-caching", Switch).value
+        fast_model = self.query_one("#select-fast-model", Select).value
+        save_general_config(
+            model,
+            max_tokens,
+            prompt_caching=prompt_caching,
+            fast_model=fast_model,
+        )
         self.notify("Settings saved.")
 
     def action_go_back(self) -> None:
@@ -2,7 +2,7 @@
 
 from textual.app import ComposeResult
 from textual.screen import ModalScreen
-from textual.widgets import Header, Footer, Static, Button, Input, TextArea
+from textual.widgets import Header, Footer, Static, Button, Input, TextArea, Checkbox
 from textual.containers import Horizontal, Vertical, VerticalScroll
 
 from prompt_enhancer.models import Template
@@ -14,10 +14,13 @@ class TemplateEditorScreen(ModalScreen[bool]):
         ("escape", "cancel", "Cancel"),
     ]
 
-    def __init__(self, template: Template | None = None) -> None:
+    def __init__(
+        self, template: Template | None = None, is_new: bool = False
+    ) -> None:
         super().__init__()
+        # is_new: ``template`` is an unsaved draft to prefill the form from.
         self.template = template
-        self.is_edit = template is not None
+        self.is_edit = template is not None and not is_new
 
     def compose(self) -> ComposeResult:
         title = "Edit Template" if self.is_edit else "New Template"
@@ -26,30 +29,35 @@ class TemplateEditorScreen(ModalScreen[bool]):
             with VerticalScroll(id="editor-scroll"):
                 yield Static("Name", classes="field-label")
                 yield Input(
-                    value=self.template.name if self.is_edit else "",
+                    value=self.template.name if self.template else "",
                     placeholder="Template name",
                     id="input-name",
                 )
                 yield Static("System Prompt", classes="field-label")
                 yield TextArea(
-                    self.template.system_prompt if self.is_edit else "",
+                    self.template.system_prompt if self.template else "",
                     id="ta-system-prompt",
                 )
                 yield Static("Domain Knowledge", classes="field-label")
                 yield TextArea(
-                    self.template.domain_knowledge if self.is_edit else "",
+                    self.template.domain_knowledge if self.template else "",
                     id="ta-domain-knowledge",
                 )
                 yield Static("Thinking Steps", classes="field-label")
                 yield TextArea(
-                    self.template.thinking_steps if self.is_edit else "",
+                    self.template.thinking_steps if self.template else "",
                     id="ta-thinking-steps",
                 )
                 yield Static("Clarifying Instructions", classes="field-label")
                 yield TextArea(
-                    self.template.clarifying_instructions if self.is_edit else "",
+                    self.template.clarifying_instructions if self.template else "",
                     id="ta-clarifying-instructions",
                 )
+                yield Checkbox(
+                    "Enable prompt caching",
+                    value=self.template.prompt_caching if self.template else False,
+                    id="cb-prompt-caching",
+                )
             with Horizontal(id="editor-buttons"):
                 yield Button("Save", id="btn-save", variant="primary")
                 yield Button("Cancel", id="btn-cancel", variant="default")
@@ -66,7 +74,7 @@ class TemplateEditorScreen(ModalScreen[bool]):
             self.notify("Template name is required.", severity="error")
             return
 
-        if self.is_edit:
+        if self.template is not None:
             self.template.name = name
             self.template.system_prompt = self.query_one(
                 "#ta-system-prompt", TextArea
@@ -80,6 +88,9 @@ class TemplateEditorScreen(ModalScreen[bool]):
             self.template.clarifying_instructions = self.query_one(
                 "#ta-clarifying-instructions", TextArea
             ).text
+            self.template.prompt_caching = self.query_one(
+                "#cb-prompt-caching", Checkbox
+            ).value
             save_template(self.template)
         else:
             template = Template(
@@ -92,6 +103,7 @@ class TemplateEditorScreen(ModalScreen[bool]):
                 clarifying_instructions=self.query_one(
                     "#ta-clarifying-instructions", TextArea
                 ).text,
+                prompt_caching=self.query_one("#cb-prompt-caching", Checkbox).value,
             )
             save_template(template)
 
@@ -2,22 +2,41 @@
 
 from textual.app import ComposeResult
 from textual.screen import Screen
-from textual.widgets import Header, Footer, Static, Button, OptionList
+from textual.widgets import Header, Footer, Static, Button, Input, OptionList
 from textual.widgets.option_list import Option
 from textual.containers import Horizontal, Vertical
 
-from prompt_enhancer.templates import list_templates, delete_template
+from prompt_enhancer.fuzzy import FuzzyIndex
+from prompt_enhancer.templates import SEARCH_FIELDS, list_templates, delete_template
+
+# Options are materialized one page at a time as the cursor nears the end.
+PAGE_SIZE = 100
+PREFETCH_MARGIN = 20
+
+
+def _searched(template) -> tuple[str, ...]:
+    # The editor saves changes into the same Template object, so edits are
+    # spotted by value rather than by identity.
+    return tuple(getattr(template, f) for f in SEARCH_FIELDS)
 
 
 class TemplateListScreen(Screen):
     BINDINGS = [
         ("escape", "go_back", "Back"),
+        ("down", "cursor_down", "Down"),
+        ("up", "cursor_up", "Up"),
     ]
 
     def __init__(self, mode: str = "select") -> None:
         super().__init__()
         self.mode = mode  # "select" or "manage"
         self._templates = []
+        self._by_id = {}
+        self._index = FuzzyIndex([])
+        self._options: dict[str, Option] = {}
+        self._searched: list[tuple[str, ...]] = []
+        self._matches: list[int] = []
+        self._shown = 0
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -26,6 +45,8 @@ class TemplateListScreen(Screen):
                 "Select a Template" if self.mode == "select" else "Manage Templates"
             )
             yield Static(title, id="template-list-title")
+            yield Input(placeholder="Type to filter templates…", id="template-filter")
+            yield Static("", id="template-filter-status")
             yield OptionList(id="template-option-list")
             with Horizontal(id="template-list-buttons"):
                 if self.mode == "manage":
@@ -36,14 +57,111 @@ class TemplateListScreen(Screen):
 
     def on_mount(self) -> None:
         self._refresh_list()
+        self.query_one("#template-filter", Input).focus()
 
     def _refresh_list(self) -> None:
-        self._templates = list_templates()
+        templates = list_templates()
+        searched = [_searched(t) for t in templates]
+        same_list = len(templates) == len(self._templates) and all(
+            a is b for a, b in zip(templates, self._templates)
+        )
+        if not same_list:
+            self._templates = templates
+            self._by_id = {t.id: t for t in templates}
+            self._index = FuzzyIndex(templates)
+            self._options = {}
+        else:
+            for i, (new, old) in enumerate(zip(searched, self._searched)):
+                if new != old:
+                    self._index.update(i)
+                    self._options.pop(templates[i].id, None)
+        self._searched = searched
+        self._apply_filter(self.query_one("#template-filter", Input).value)
+
+    def _apply_filter(self, query: str) -> None:
         option_list = self.query_one("#template-option-list", OptionList)
-        option_list.clear_options()
-        for t in self._templates:
-            label = f"{'[builtin] ' if t.builtin else ''}{t.name}"
-            option_list.add_option(Option(label, id=t.id))
+        highlighted = option_list.highlighted_option
+        self._matches = self._index.search(query)
+
+        # Reuse the rows already showing the right templates, and the option
+        # objects (with their rendered labels) for the rest, rather than
+        # rebuilding the list on every keystroke. An edited template's cached
+        # option was dropped, so its row no longer matches and is replaced.
+        templates = self._templates
+        shown = option_list.options
+        kept = 0
+        for option, i in zip(shown, self._matches):
+            if option is not self._options.get(templates[i].id):
+                break
+            kept += 1
+        self._shown = kept
+        if kept < len(shown):
+            option_list.set_options(shown[:kept] + self._page(PAGE_SIZE - kept))
+        elif kept < PAGE_SIZE:
+            option_list.add_options(self._page(PAGE_SIZE - kept))
+
+        if self._matches:
+            option_list.highlighted = 0
+            if highlighted is not None and not query:
+                # Keep the cursor on the same template after a refresh.
+                try:
+                    option_list.highlighted = option_list.get_option_index(
+                        highlighted.id
+                    )
+                except LookupError:
+                    pass
+
+        total = len(templates)
+        status = self.query_one("#template-filter-status", Static)
+        if query.strip():
+            status.update(f"{len(self._matches):,} of {total:,} templates")
+        else:
+            status.update(f"{total:,} templates")
+
+    def _page(self, count: int) -> list[Option]:
+        """Options for the next ``count`` matches, counted as shown."""
+        page = self._matches[self._shown : self._shown + count]
+        options = []
+        for i in page:
+            t = self._templates[i]
+            option = self._options.get(t.id)
+            if option is None:
+                label = f"{'[builtin] ' if t.builtin else ''}{t.name}"
+                option = self._options[t.id] = Option(label, id=t.id)
+            options.append(option)
+        self._shown += len(page)
+        return options
+
+    def _show_more(self) -> None:
+        """Materialize the next page of matches as options."""
+        options = self._page(PAGE_SIZE)
+        if options:
+            self.query_one("#template-option-list", OptionList).add_options(options)
+
+    def _highlighted_template(self):
+        option = self.query_one("#template-option-list", OptionList).highlighted_option
+        return self._by_id.get(option.id) if option is not None else None
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "template-filter":
+            self._apply_filter(event.value)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        if event.input.id != "template-filter":
+            return
+        template = self._highlighted_template()
+        if template is None:
+            return
+        if self.mode == "select":
+            self._start_session(template.id)
+        else:
+            self._edit_selected()
+
+    def on_option_list_option_highlighted(
+        self, event: OptionList.OptionHighlighted
+    ) -> None:
+        if event.option_index >= self._shown - PREFETCH_MARGIN:
+            self._show_more()
 
     def on_option_list_option_selected(
         self, event: OptionList.OptionSelected
@@ -51,6 +169,12 @@ class TemplateListScreen(Screen):
         if self.mode == "select":
             self._start_session(event.option.id)
 
+    def action_cursor_down(self) -> None:
+        self.query_one("#template-option-list", OptionList).action_cursor_down()
+
+    def action_cursor_up(self) -> None:
+        self.query_one("#template-option-list", OptionList).action_cursor_up()
+
     def _start_session(self, template_id: str) -> None:
         from prompt_enhancer.config import load_config
 
@@ -98,37 +222,31 @@ class TemplateListScreen(Screen):
             self._delete_selected()
 
     def _edit_selected(self) -> None:
-        option_list = self.query_one("#template-option-list", OptionList)
-        if option_list.highlighted is not None:
-            idx = option_list.highlighted
-            if idx < len(self._templates):
-                template = self._templates[idx]
-                if template.builtin:
-                    self.notify("Cannot edit built-in templates.", severity="warning")
-                    return
-                from prompt_enhancer.screens.template_editor import (
-                    TemplateEditorScreen,
-                )
+        template = self._highlighted_template()
+        if template is not None:
+            if template.builtin:
+                self.notify("Cannot edit built-in templates.", severity="warning")
+                return
+            from prompt_enhancer.screens.template_editor import (
+                TemplateEditorScreen,
+            )
 
-                self.app.push_screen(
-                    TemplateEditorScreen(template=template),
-                    callback=lambda _: self._refresh_list(),
-                )
+            self.app.push_screen(
+                TemplateEditorScreen(template=template),
+                callback=lambda _: self._refresh_list(),
+            )
 
     def _delete_selected(self) -> None:
-        option_list = self.query_one("#template-option-list", OptionList)
-        if option_list.highlighted is not None:
-            idx = option_list.highlighted
-            if idx < len(self._templates):
-                template = self._templates[idx]
-                if template.builtin:
-                    self.notify(
-                        "Cannot delete built-in templates.", severity="warning"
-                    )
-                    return
-                delete_template(template.id)
-                self.notify(f"Deleted '{template.name}'.")
-                self._refresh_list()
+        template = self._highlighted_template()
+        if template is not None:
+            if template.builtin:
+                self.notify(
+                    "Cannot delete built-in templates.", severity="warning"
+                )
+                return
+            delete_template(template.id)
+            self.notify(f"Deleted '{template.name}'.")
+            self._refresh_list()
 
     def action_go_back(self) -> None:
         self.app.pop_screen()
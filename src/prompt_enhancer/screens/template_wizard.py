@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+
 from textual.app import ComposeResult
+from textual.markup import escape
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Static, Button, Input, TextArea
 from textual.containers import Horizontal, Vertical, VerticalScroll
+from textual.worker import Worker
 
+from prompt_enhancer.metrics import RequestMetrics, subscribe, unsubscribe
 from prompt_enhancer.models import AppConfig, Template
+from prompt_enhancer.profiling import profiled
 from prompt_enhancer.wizard_api import (
     TEMPLATE_FIELDS,
     FIELD_DESCRIPTIONS,
+    draft_template,
     generate_suggestions,
+    stream_suggestions,
 )
 from prompt_enhancer.templates import save_template
 
@@ -30,12 +38,21 @@ class TemplateWizardScreen(Screen):
         self._current_value: str | None = None
         self._suggestions: list[str] = []
         self._loading = False
+        self._fetch_id = 0
+        # Speculative refine requests for the suggestions on screen, keyed by
+        # suggestion text; capped at config.prefetch_budget per field.
+        self._prefetch_workers: dict[str, Worker] = {}
+        self._prefetched: dict[str, list[str]] = {}
+        self._prefetch_spent = 0
+        self._awaiting_prefetch: str | None = None
+        self._prefetch_limit = asyncio.Semaphore(max(1, config.prefetch_concurrency))
 
     def compose(self) -> ComposeResult:
         yield Header()
         with VerticalScroll(id="wizard-container"):
             yield Static("New Template Wizard", id="wizard-title")
             yield Static("Step 1 of 5: Template Name", id="wizard-progress")
+            yield Static("", id="wizard-metrics")
             yield Static("", id="wizard-field-description")
 
             with Vertical(id="wizard-name-section"):
@@ -43,9 +60,20 @@ class TemplateWizardScreen(Screen):
                     placeholder="Enter a name for your template...",
                     id="wizard-name-input",
                 )
-                yield Button(
-                    "Continue", id="wizard-btn-name-continue", variant="primary"
+                yield Input(
+                    placeholder="Optional: what is this template for?",
+                    id="wizard-description-input",
                 )
+                with Horizontal(id="wizard-name-actions"):
+                    yield Button(
+                        "Continue", id="wizard-btn-name-continue", variant="primary"
+                    )
+                    yield Button(
+                        "Draft whole template",
+                        id="wizard-btn-draft",
+                        variant="default",
+                    )
+                yield Static("", id="wizard-draft-status")
 
             with Vertical(id="wizard-field-section", classes="hidden"):
                 yield Static("", id="wizard-field-title")
@@ -59,6 +87,11 @@ class TemplateWizardScreen(Screen):
                         id="wizard-btn-custom",
                         variant="default",
                     )
+                    yield Button(
+                        "Regenerate",
+                        id="wizard-btn-regenerate",
+                        variant="default",
+                    )
                     yield Button(
                         "Done",
                         id="wizard-btn-done",
@@ -81,24 +114,39 @@ class TemplateWizardScreen(Screen):
         yield Footer()
 
     def on_mount(self) -> None:
+        subscribe(self._on_request_finished)
         self.query_one("#wizard-name-input", Input).focus()
 
+    def on_unmount(self) -> None:
+        unsubscribe(self._on_request_finished)
+
+    def _on_request_finished(self, metrics: RequestMetrics) -> None:
+        self.query_one("#wizard-metrics", Static).update(
+            f"Last request: {metrics.kind} · {metrics.model} · {metrics.describe()}"
+        )
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
-        if event.input.id == "wizard-name-input":
+        if event.input.id in ("wizard-name-input", "wizard-description-input"):
             self._submit_name()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "wizard-btn-name-continue":
             self._submit_name()
+        elif event.button.id == "wizard-btn-draft":
+            self._draft_whole_template()
         elif event.button.id == "wizard-btn-custom":
             self._show_custom_input()
+        elif event.button.id == "wizard-btn-regenerate":
+            self._cancel_prefetch()
+            self._fetch_suggestions(
+                refine=self._current_value is not None, regenerate=True
+            )
         elif event.button.id == "wizard-btn-use-custom":
             self._apply_custom_value()
         elif event.button.id == "wizard-btn-done":
             self._accept_and_advance()
-        elif event.button.id and event.button.id.startswith("wizard-sug-"):
-            idx = int(event.button.id.split("-")[-1])
-            self._select_suggestion(idx)
+        elif event.button.has_class("wizard-suggestion-btn"):
+            self._select_suggestion(int(event.button.name))
 
     def _submit_name(self) -> None:
         name_input = self.query_one("#wizard-name-input", Input)
@@ -110,6 +158,52 @@ class TemplateWizardScreen(Screen):
         self._step = 0
         self._enter_field_step()
 
+    def _draft_whole_template(self) -> None:
+        if self._loading:
+            return
+        name = self.query_one("#wizard-name-input", Input).value.strip()
+        if not name:
+            self.notify("Please enter a template name.", severity="warning")
+            return
+        description = self.query_one("#wizard-description-input", Input).value.strip()
+        self._template_name = name
+        self._loading = True
+        self.query_one("#wizard-btn-draft", Button).disabled = True
+        self.query_one("#wizard-draft-status", Static).update(
+            "[bold yellow]Drafting all fields...[/bold yellow]"
+        )
+        self.run_worker(profiled(self._do_draft(name, description)), exclusive=True)
+
+    async def _do_draft(self, name: str, description: str) -> None:
+        status = self.query_one("#wizard-draft-status", Static)
+        try:
+            fields = await draft_template(self.config, name, description)
+        except Exception as e:
+            error_msg = str(e)
+            if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
+                status.update(
+                    "[bold red]API Error:[/bold red] Invalid API key. "
+                    "Please check Settings."
+                )
+            else:
+                status.update(f"[bold red]Error:[/bold red] {escape(error_msg)}")
+            return
+        finally:
+            self._loading = False
+            self.query_one("#wizard-btn-draft", Button).disabled = False
+
+        status.update("")
+        from prompt_enhancer.screens.template_editor import TemplateEditorScreen
+
+        def on_editor_closed(saved: bool) -> None:
+            if saved:
+                self.app.pop_screen()
+
+        self.app.push_screen(
+            TemplateEditorScreen(template=Template(name=name, **fields), is_new=True),
+            callback=on_editor_closed,
+        )
+
     def _enter_field_step(self) -> None:
         field_key, field_label = TEMPLATE_FIELDS[self._step]
 
@@ -128,6 +222,7 @@ class TemplateWizardScreen(Screen):
         # Reset field state
         self._current_value = None
         self._suggestions = []
+        self._reset_prefetch()
         self.query_one("#wizard-field-title", Static).update(
             f"[bold]{field_label}[/bold]"
         )
@@ -137,7 +232,9 @@ class TemplateWizardScreen(Screen):
 
         self._fetch_suggestions()
 
-    def _fetch_suggestions(self, refine: bool = False) -> None:
+    def _fetch_suggestions(
+        self, refine: bool = False, regenerate: bool = False
+    ) -> None:
         if self._loading:
             return
         self._loading = True
@@ -147,26 +244,38 @@ class TemplateWizardScreen(Screen):
         # Clear existing buttons
         container = self.query_one("#wizard-suggestions", Vertical)
         container.remove_children()
+        self._suggestions = []
 
+        self._fetch_id += 1
         self.run_worker(
-            self._do_fetch_suggestions(refine), exclusive=True
+            profiled(
+                self._do_fetch_suggestions(refine, regenerate, self._fetch_id)
+            ),
+            exclusive=True,
         )
 
-    async def _do_fetch_suggestions(self, refine: bool) -> None:
+    async def _do_fetch_suggestions(
+        self, refine: bool, regenerate: bool, fetch_id: int
+    ) -> None:
         field_key = TEMPLATE_FIELDS[self._step][0]
         status = self.query_one("#wizard-status", Static)
 
         try:
-            suggestions = await generate_suggestions(
+            # Buttons are mounted one by one as each suggestion completes.
+            async for suggestion in stream_suggestions(
                 config=self.config,
                 template_name=self._template_name,
                 field_key=field_key,
-                completed_fields=self._field_values,
+                completed_fields=dict(self._field_values),
                 current_value=self._current_value if refine else None,
-            )
-            self._suggestions = suggestions
+                regenerate=regenerate,
+            ):
+                if fetch_id != self._fetch_id:
+                    return
+                self._suggestions.append(suggestion)
+                self._mount_suggestion_button(len(self._suggestions) - 1)
+                self._start_prefetch()
             status.update("")
-            self._render_suggestion_buttons()
         except Exception as e:
             error_msg = str(e)
             if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
@@ -175,33 +284,133 @@ class TemplateWizardScreen(Screen):
                     "Please check Settings."
                 )
             else:
-                status.update(f"[bold red]Error:[/bold red] {error_msg}")
+                status.update(f"[bold red]Error:[/bold red] {escape(error_msg)}")
         finally:
-            self._loading = False
+            if fetch_id == self._fetch_id:
+                self._loading = False
 
     def _render_suggestion_buttons(self) -> None:
         container = self.query_one("#wizard-suggestions", Vertical)
         container.remove_children()
 
-        for i, suggestion in enumerate(self._suggestions):
-            # Show first ~100 chars as a preview
-            label = suggestion.replace("\n", " ")
-            if len(label) > 100:
-                label = label[:97] + "..."
-            btn = Button(
-                f"  {i + 1}. {label}",
-                id=f"wizard-sug-{i}",
-                classes="wizard-suggestion-btn",
-            )
-            container.mount(btn)
+        for i in range(len(self._suggestions)):
+            self._mount_suggestion_button(i)
+
+    def _mount_suggestion_button(self, i: int) -> None:
+        # Show first ~100 chars as a preview
+        label = self._suggestions[i].replace("\n", " ")
+        if len(label) > 100:
+            label = label[:97] + "..."
+        btn = Button(
+            f"  {i + 1}. {label}",
+            # Not an id: buttons are replaced before the old ones are gone.
+            name=str(i),
+            classes="wizard-suggestion-btn",
+        )
+        self.query_one("#wizard-suggestions", Vertical).mount(btn)
 
     def _select_suggestion(self, idx: int) -> None:
-        if idx < len(self._suggestions):
-            self._current_value = self._suggestions[idx]
-            self._show_current_value()
-            self.query_one("#wizard-btn-done", Button).disabled = False
+        if self._awaiting_prefetch is not None or idx >= len(self._suggestions):
+            return
+        if self._loading:
+            # Picked while later suggestions are still streaming in.
+            self._fetch_id += 1
+            self.workers.cancel_group(self, "default")
+            self._loading = False
+            self.query_one("#wizard-status", Static).update("")
+        chosen = self._suggestions[idx]
+        self._current_value = chosen
+        self._show_current_value()
+        self.query_one("#wizard-btn-done", Button).disabled = False
+        self._cancel_prefetch(keep=chosen)
+
+        if chosen in self._prefetched:
+            self._show_prefetched(chosen)
+        elif chosen in self._prefetch_workers:
+            # Already in flight; it renders the refinements when it finishes.
+            self._awaiting_prefetch = chosen
+            self._loading = True
+            self.query_one("#wizard-suggestions", Vertical).remove_children()
+            self.query_one("#wizard-status", Static).update(
+                "[bold yellow]Generating suggestions...[/bold yellow]"
+            )
+        else:
             self._fetch_suggestions(refine=True)
 
+    def _start_prefetch(self) -> None:
+        """Start refine requests for the suggestions just rendered."""
+        if not self.config.wizard_prefetch:
+            return
+        field_key = TEMPLATE_FIELDS[self._step][0]
+        completed = dict(self._field_values)
+        for suggestion in self._suggestions:
+            if self._prefetch_spent >= self.config.prefetch_budget:
+                break
+            if suggestion in self._prefetched or suggestion in self._prefetch_workers:
+                continue
+            self._prefetch_spent += 1
+            self._prefetch_workers[suggestion] = self.run_worker(
+                profiled(
+                    self._prefetch_refinement(field_key, completed, suggestion)
+                ),
+                group="prefetch",
+                exit_on_error=False,
+            )
+
+    async def _prefetch_refinement(
+        self, field_key: str, completed: dict[str, str], suggestion: str
+    ) -> None:
+        try:
+            async with self._prefetch_limit:
+                refinements = await generate_suggestions(
+                    config=self.config,
+                    template_name=self._template_name,
+                    field_key=field_key,
+                    completed_fields=completed,
+                    current_value=suggestion,
+                )
+        except Exception:
+            refinements = None
+        finally:
+            self._prefetch_workers.pop(suggestion, None)
+
+        if self._awaiting_prefetch == suggestion:
+            self._awaiting_prefetch = None
+            self._loading = False
+            if refinements is None:
+                # Fall back to a normal request so errors are shown as usual.
+                self._fetch_suggestions(refine=True)
+                return
+            self._prefetched[suggestion] = refinements
+            self._show_prefetched(suggestion)
+        elif refinements is not None:
+            self._prefetched[suggestion] = refinements
+
+    def _show_prefetched(self, suggestion: str) -> None:
+        self._suggestions = list(self._prefetched[suggestion])
+        self.query_one("#wizard-status", Static).update("")
+        self._render_suggestion_buttons()
+        self._start_prefetch()
+
+    def _cancel_prefetch(self, keep: str | None = None) -> None:
+        """Cancel in-flight prefetches other than ``keep``."""
+        for suggestion, worker in list(self._prefetch_workers.items()):
+            if suggestion != keep:
+                worker.cancel()
+                del self._prefetch_workers[suggestion]
+                if suggestion == self._awaiting_prefetch:
+                    # Its worker won't get to clear the loading state.
+                    self._awaiting_prefetch = None
+                    self._loading = False
+
+    def _reset_prefetch(self) -> None:
+        self._cancel_prefetch()
+        self._prefetched.clear()
+        self._prefetch_spent = 0
+        if self._awaiting_prefetch is not None:
+            self._awaiting_prefetch = None
+            self._loading = False
+
     def _show_custom_input(self) -> None:
         custom_section = self.query_one("#wizard-custom-section")
         custom_section.remove_class("hidden")
@@ -219,6 +428,7 @@ class TemplateWizardScreen(Screen):
         self._show_current_value()
         self.query_one("#wizard-custom-section").add_class("hidden")
         self.query_one("#wizard-btn-done", Button).disabled = False
+        self._cancel_prefetch()
         self._fetch_suggestions(refine=True)
 
     def _show_current_value(self) -> None:
@@ -0,0 +1,76 @@
+"""Debug screen with the event-loop lag watchdog's live numbers."""
+
+from __future__ import annotations
+
+from textual.markup import escape
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.widgets import Header, Footer, Static
+from textual.containers import VerticalScroll
+
+from prompt_enhancer.watchdog import get_watchdog
+
+BAR_WIDTH = 40
+# Innermost frames shown under each stall; the full stack is in the report.
+STACK_LINES = 8
+
+
+class WatchdogScreen(Screen):
+    BINDINGS = [
+        ("escape", "go_back", "Back"),
+    ]
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        with VerticalScroll(id="watchdog-container"):
+            yield Static("Event Loop Lag", id="watchdog-title")
+            yield Static("", id="watchdog-summary")
+            yield Static("", id="watchdog-histogram")
+            yield Static("Stalls", classes="field-label")
+            yield Static("", id="watchdog-stalls")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self._refresh()
+        self.set_interval(1.0, self._refresh)
+
+    def _refresh(self) -> None:
+        watchdog = get_watchdog()
+        summary = self.query_one("#watchdog-summary", Static)
+        if watchdog is None:
+            summary.update(
+                "The watchdog is off. Start with [bold]prompt-enhancer --watchdog[/bold] "
+                'or set [bold]"watchdog": true[/bold] in config.json.'
+            )
+            return
+        snap = watchdog.snapshot()
+        summary.update(
+            f"{snap['samples']:,} heartbeats every {snap['interval_ms']:.0f} ms · "
+            f"worst lag {snap['worst_ms']:.0f} ms · "
+            f"{snap['over_frame']:,} over {snap['frame_ms']:.0f} ms · "
+            f"{snap['over_stall']:,} over {snap['stall_ms']:.0f} ms"
+        )
+
+        counts = snap["histogram"]
+        peak = max(counts.values()) or 1
+        lines = []
+        for bound, count in counts.items():
+            label = "> 1000 ms" if bound == "inf" else f"≤ {bound} ms"
+            bar = "█" * (round(count / peak * BAR_WIDTH) if count else 0)
+            lines.append(f"{label:>10} {bar} {count:,}")
+        self.query_one("#watchdog-histogram", Static).update("\n".join(lines))
+
+        stalls = []
+        for stall in snap["stalls"]:
+            stalls.append(
+                f"[bold]{escape(stall['culprit'])}[/bold] × {stall['count']} · "
+                f"{stall['total_ms']:.0f} ms total · worst {stall['worst_ms']:.0f} ms"
+            )
+            stack = "\n".join(stall["stack"][-STACK_LINES:])
+            stalls.append(f"[dim]{escape(stack)}[/dim]\n")
+        self.query_one("#watchdog-stalls", Static).update(
+            "\n".join(stalls) or "No stalls captured."
+        )
+
+    def action_go_back(self) -> None:
+        self.app.pop_screen()
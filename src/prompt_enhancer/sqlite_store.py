@@ -0,0 +1,326 @@
+"""SQLite-backed template store with full-text search.
+
+An optional alternative to the one-JSON-file-per-template layout: all user
+templates live in one database (``~/.prompt_enhancer/templates.db``) with an
+FTS5 index over the name and the four prompt fields. The database runs in
+WAL mode so readers never block on a writer. Enable it with
+``"template_store": "sqlite"`` in config.json; existing JSON templates are
+imported once on first use.
+
+Saves and deletes are committed on the ``BackgroundWriter`` thread, like the
+JSON store's files, so the UI never waits on a transaction or its fsync.
+Until a change is committed, reads are answered from the queued copy.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+
+from prompt_enhancer.builtin_templates import BUILTIN_TEMPLATES
+from prompt_enhancer.models import Template
+from prompt_enhancer.persistence import BackgroundWriter, get_writer
+from prompt_enhancer.templates import SEARCH_FIELDS
+
+_COLUMNS = ", ".join(SEARCH_FIELDS)
+_NEW_VALUES = ", ".join(f"new.{f}" for f in SEARCH_FIELDS)
+_OLD_VALUES = ", ".join(f"old.{f}" for f in SEARCH_FIELDS)
+# Roughly FTS5's default unicode61 tokenizer: runs of letters and digits,
+# lowercased, with diacritics removed.
+_TOKEN = re.compile(r"[^\W_]+")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS templates (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    system_prompt TEXT NOT NULL DEFAULT '',
+    domain_knowledge TEXT NOT NULL DEFAULT '',
+    thinking_steps TEXT NOT NULL DEFAULT '',
+    clarifying_instructions TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS templates_fts USING fts5(
+    {_COLUMNS}, content='templates', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS templates_ai AFTER INSERT ON templates BEGIN
+    INSERT INTO templates_fts(rowid, {_COLUMNS}) VALUES (new.rowid, {_NEW_VALUES});
+END;
+CREATE TRIGGER IF NOT EXISTS templates_ad AFTER DELETE ON templates BEGIN
+    INSERT INTO templates_fts(templates_fts, rowid, {_COLUMNS})
+    VALUES ('delete', old.rowid, {_OLD_VALUES});
+END;
+CREATE TRIGGER IF NOT EXISTS templates_au AFTER UPDATE ON templates BEGIN
+    INSERT INTO templates_fts(templates_fts, rowid, {_COLUMNS})
+    VALUES ('delete', old.rowid, {_OLD_VALUES});
+    INSERT INTO templates_fts(rowid, {_COLUMNS}) VALUES (new.rowid, {_NEW_VALUES});
+END;
+"""
+
+_UPSERT = f"""
+INSERT INTO templates (id, {_COLUMNS}, data) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    {", ".join(f"{f} = excluded.{f}" for f in SEARCH_FIELDS)},
+    data = excluded.data
+"""
+
+
+def _row_values(template: Template) -> tuple:
+    return (
+        template.id,
+        *(getattr(template, f) for f in SEARCH_FIELDS),
+        template.to_json(),
+    )
+
+
+def _by_file_name(templates: dict[str, Template]) -> list[Template]:
+    # Same order as the JSON store, which sorts by file name.
+    return [templates[i] for i in sorted(templates, key=lambda i: f"{i}.json")]
+
+
+def _match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word, as a prefix."""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def _tokens(text: str) -> list[str]:
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return _TOKEN.findall("".join(c for c in decomposed if not unicodedata.combining(c)))
+
+
+def _query_phrases(query: str) -> list[list[str]]:
+    """The token phrases ``_match_query`` asks FTS5 for, one per word."""
+    return [phrase for phrase in map(_tokens, query.split()) if phrase]
+
+
+def _has_phrase(tokens: list[str], phrase: list[str]) -> bool:
+    # Consecutive tokens, the last one matched as a prefix.
+    *whole, last = phrase
+    n = len(whole)
+    return any(
+        tokens[i : i + n] == whole and tokens[i + n].startswith(last)
+        for i in range(len(tokens) - n)
+    )
+
+
+def _matches(template: Template, phrases: list[list[str]]) -> bool:
+    """Match ``template`` in Python the way FTS5 would match its row."""
+    columns = [_tokens(getattr(template, f)) for f in SEARCH_FIELDS]
+    return bool(phrases) and all(
+        any(_has_phrase(tokens, phrase) for tokens in columns) for phrase in phrases
+    )
+
+
+class SqliteTemplateStore:
+    """Same surface as ``templates.TemplateRepository``, backed by SQLite."""
+
+    def __init__(
+        self,
+        path: Path,
+        builtins: list[Template] = BUILTIN_TEMPLATES,
+        writer: BackgroundWriter | None = None,
+    ) -> None:
+        self.path = path
+        self._builtins = {t.id: t for t in builtins}
+        self._writer = writer or get_writer()
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # id -> (template or None for a delete, row to upsert); a new tuple
+        # per change, so a commit can tell whether it was changed again.
+        self._queued: dict[str, tuple[Template | None, tuple | None]] = {}
+        self._queued_lock = threading.Lock()
+        self._writes = 0
+        self._committed: dict[str, Template] = {}
+        self._sorted: list[Template] | None = None
+        self._sorted_version: tuple | None = None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets them read while another writes."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _version(self) -> tuple:
+        # data_version changes when another connection commits; _writes
+        # covers commits made through this store.
+        conn = self._conn()
+        (data_version,) = conn.execute("PRAGMA data_version").fetchone()
+        return (id(conn), data_version, self._writes)
+
+    def _write(self, statements: list[tuple[str, tuple]]) -> int:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                changed = 0
+                for sql, params in statements:
+                    changed += conn.execute(sql, params).rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._writes += 1
+            return changed
+
+    def _queue(self, template_id: str, template: Template | None) -> None:
+        row = _row_values(template) if template is not None else None
+        with self._queued_lock:
+            self._queued[template_id] = (template, row)
+        self._writer.call(self.path, self._commit_queued)
+
+    def _commit_queued(self) -> None:
+        """Commit every queued change in one transaction; runs on the writer."""
+        with self._queued_lock:
+            batch = dict(self._queued)
+        self._write(
+            [
+                (_UPSERT, row)
+                if row is not None
+                else ("DELETE FROM templates WHERE id = ?", (template_id,))
+                for template_id, (_, row) in batch.items()
+            ]
+        )
+        with self._queued_lock:
+            for template_id, change in batch.items():
+                if self._queued.get(template_id) is change:
+                    del self._queued[template_id]
+
+    def _queued_changes(self) -> dict[str, Template | None]:
+        with self._queued_lock:
+            return {
+                template_id: template
+                for template_id, (template, _) in self._queued.items()
+            }
+
+    def list_templates(self) -> list[Template]:
+        # Taken first: a change committed while the rows are read is then
+        # still applied on top of them.
+        queued = self._queued_changes()
+        version = self._version()
+        if self._sorted is None or self._sorted_version != version:
+            rows = self._conn().execute("SELECT id, data FROM templates").fetchall()
+            combined = {
+                template_id: Template.from_json(data)
+                for template_id, data in rows
+                if template_id not in self._builtins
+            }
+            combined.update(self._builtins)
+            self._committed = combined
+            self._sorted = _by_file_name(combined)
+            self._sorted_version = version
+        if not queued:
+            return list(self._sorted)
+        combined = dict(self._committed)
+        for template_id, template in queued.items():
+            if template_id in self._builtins:
+                continue
+            if template is None:
+                combined.pop(template_id, None)
+            else:
+                combined[template_id] = template
+        return _by_file_name(combined)
+
+    def get_template(self, template_id: str) -> Template | None:
+        if template_id in self._builtins:
+            return self._builtins[template_id]
+        with self._queued_lock:
+            change = self._queued.get(template_id)
+        if change is not None:
+            return change[0]
+        row = (
+            self._conn()
+            .execute("SELECT data FROM templates WHERE id = ?", (template_id,))
+            .fetchone()
+        )
+        return Template.from_json(row[0]) if row else None
+
+    def save_template(self, template: Template) -> Template:
+        self._queue(template.id, template)
+        return template
+
+    def delete_template(self, template_id: str) -> bool:
+        if template_id in self._builtins:
+            return False
+        existed = self.get_template(template_id) is not None
+        self._queue(template_id, None)
+        return existed
+
+    def search_templates(self, query: str, limit: int = 50) -> list[Template]:
+        """Full-text search over name and prompt fields, best matches first."""
+        match = _match_query(query)
+        if not match:
+            return []
+        # Builtins and uncommitted changes aren't in the index, so they are
+        # matched by the same rules to give the same answer after a flush.
+        phrases = _query_phrases(query)
+        queued = self._queued_changes()
+        results = [
+            t
+            for t in [*self._builtins.values(), *filter(None, queued.values())]
+            if _matches(t, phrases)
+        ]
+        rows = self._conn().execute(
+            "SELECT t.id, t.data FROM templates_fts f "
+            "JOIN templates t ON t.rowid = f.rowid WHERE templates_fts MATCH ? "
+            "ORDER BY bm25(templates_fts, 10.0, 1.0, 1.0, 1.0, 1.0) LIMIT ?",
+            (match, limit),
+        ).fetchall()
+        # Rows with a queued change were matched (or not) above instead.
+        results += [
+            Template.from_json(data)
+            for template_id, data in rows
+            if template_id not in queued
+        ]
+        return results[:limit]
+
+    def import_directory(self, directory: Path) -> int:
+        """Import every readable ``*.json`` template in ``directory``.
+
+        Existing rows with the same id are overwritten. Returns the number
+        of templates imported.
+        """
+        rows = []
+        for path in sorted(directory.glob("*.json")):
+            if path.stem in self._builtins:
+                continue
+            try:
+                template = Template.load(path)
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            template.id = path.stem
+            rows.append(_row_values(template))
+        if rows:
+            self._write([(_UPSERT, row) for row in rows])
+        return len(rows)
+
+    def import_directory_once(self, directory: Path) -> int:
+        """Run ``import_directory`` the first time this database is opened."""
+        key = f"imported:{directory}"
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        count = self.import_directory(directory) if directory.is_dir() else 0
+        self._write(
+            [
+                (
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    (key, json.dumps({"count": count})),
+                )
+            ]
+        )
+        return count
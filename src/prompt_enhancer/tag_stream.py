@@ -0,0 +1,110 @@
+"""Incremental parser for XML-style tags in streamed model output.
+
+Consumes text chunks exactly once and reports what is inside and outside
+``<tag>...</tag>`` as it arrives, including tags split across chunk
+boundaries. Whitespace just inside the tags is dropped, matching the
+``<tag>\\s*(.*?)\\s*</tag>`` regexes used on complete responses.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+TEXT = "text"
+START = "start"
+DELTA = "delta"
+END = "end"
+
+
+@dataclass
+class TagEvent:
+    """A parse event.
+
+    ``text`` events carry text outside the tag, ``delta`` events carry new
+    content inside it, and ``end`` carries the tag's complete content.
+    """
+
+    kind: str
+    text: str = ""
+
+
+class TagStreamParser:
+    def __init__(self, tag: str) -> None:
+        self._open = f"<{tag}>"
+        self._close = f"</{tag}>"
+        self._pending = ""  # tail that may be the start of a tag
+        self._inside = False
+        self._at_content_start = False
+        self._held_whitespace = ""
+        self._parts: list[str] = []
+        self.completed: list[str] = []
+
+    @property
+    def inside(self) -> bool:
+        return self._inside
+
+    @property
+    def latest(self) -> str | None:
+        """Content of the most recently closed tag."""
+        return self.completed[-1] if self.completed else None
+
+    def feed(self, chunk: str) -> list[TagEvent]:
+        events: list[TagEvent] = []
+        buf = self._pending + chunk
+        self._pending = ""
+        while buf:
+            marker = self._close if self._inside else self._open
+            idx = buf.find(marker)
+            if idx < 0:
+                keep = _partial_suffix(buf, marker)
+                if keep:
+                    self._pending = buf[-keep:]
+                    buf = buf[:-keep]
+                self._emit(buf, events, final=False)
+                break
+            self._emit(buf[:idx], events, final=True)
+            buf = buf[idx + len(marker) :]
+            if self._inside:
+                content = "".join(self._parts)
+                self._parts = []
+                self.completed.append(content)
+                events.append(TagEvent(END, content))
+            else:
+                self._at_content_start = True
+                events.append(TagEvent(START))
+            self._inside = not self._inside
+        return events
+
+    def close(self) -> list[TagEvent]:
+        """Flush at end of stream. An unterminated tag is left unclosed."""
+        events: list[TagEvent] = []
+        pending, self._pending = self._pending, ""
+        if not self._inside:
+            self._emit(pending, events, final=True)
+        return events
+
+    def _emit(self, text: str, events: list[TagEvent], final: bool) -> None:
+        if not self._inside:
+            if text:
+                events.append(TagEvent(TEXT, text))
+            return
+        if self._at_content_start:
+            text = text.lstrip()
+            if not text:
+                return
+            self._at_content_start = False
+        # Hold back trailing whitespace until we know it isn't the tag's end.
+        text = self._held_whitespace + text
+        content = text.rstrip()
+        self._held_whitespace = "" if final else text[len(content) :]
+        if content:
+            self._parts.append(content)
+            events.append(TagEvent(DELTA, content))
+
+
+def _partial_suffix(buf: str, marker: str) -> int:
+    """Length of the longest suffix of ``buf`` that is a proper prefix of ``marker``."""
+    start = buf.rfind("<", max(0, len(buf) - len(marker) + 1))
+    if start >= 0 and marker.startswith(buf[start:]):
+        return len(buf) - start
+    return 0
@@ -1,53 +1,213 @@
-"""Template CRUD operations using JSON files in ~/.prompt_enhancer/templates/."""
+"""Template CRUD operations using JSON files in ~/.prompt_enhancer/templates/.
+
+With ``"template_store": "sqlite"`` in config.json the same functions are
+served by ``sqlite_store.SqliteTemplateStore`` instead.
+"""
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from prompt_enhancer.models import Template
 from prompt_enhancer.builtin_templates import BUILTIN_TEMPLATES
+from prompt_enhancer.persistence import BackgroundWriter, get_writer
+from prompt_enhancer.profiling import profiled_call
 
 TEMPLATES_DIR = Path.home() / ".prompt_enhancer" / "templates"
+TEMPLATES_DB = Path.home() / ".prompt_enhancer" / "templates.db"
 
+SEARCH_FIELDS = (
+    "name",
+    "system_prompt",
+    "domain_knowledge",
+    "thinking_steps",
+    "clarifying_instructions",
+)
 
-def _ensure_builtins() -> None:
-    """Write builtin templates to disk if they don't exist."""
-    TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
-    for template in BUILTIN_TEMPLATES:
-        path = TEMPLATES_DIR / f"{template.id}.json"
-        if not path.exists():
-            template.save(path)
 
+class TemplateRepository:
+    """In-memory id -> Template index over a directory of JSON files.
 
-def list_templates() -> list[Template]:
-    _ensure_builtins()
-    templates = []
-    for path in sorted(TEMPLATES_DIR.glob("*.json")):
+    Builtin templates are served from memory. User templates are indexed by
+    file name, and each refresh only re-reads files whose mtime or size
+    changed since the last snapshot. Saves and deletes update the index in
+    place and go to disk through a ``BackgroundWriter``; files with a write
+    still queued are left alone by refreshes until it lands.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        builtins: list[Template] = BUILTIN_TEMPLATES,
+        writer: BackgroundWriter | None = None,
+    ) -> None:
+        self.directory = directory
+        self._builtins = {t.id: t for t in builtins}
+        self._writer = writer or get_writer()
+        self._index: dict[str, Template] = {}
+        self._snapshot: dict[str, tuple[int, int]] = {}
+        self._sorted: list[Template] | None = None
+
+    def _path(self, template_id: str) -> Path:
+        return self.directory / f"{template_id}.json"
+
+    def _load(self, template_id: str, path: Path, signature: tuple[int, int]) -> None:
+        try:
+            template = Template.load(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            template = None
+        self._snapshot[template_id] = signature
+        if template is None:
+            self._index.pop(template_id, None)
+        else:
+            self._index[template_id] = template
+        self._sorted = None
+
+    def _forget(self, template_id: str) -> None:
+        self._snapshot.pop(template_id, None)
+        if self._index.pop(template_id, None) is not None:
+            self._sorted = None
+
+    def refresh(self) -> None:
+        """Sync the index with the directory, re-reading only changed files."""
+        seen: set[str] = set()
+        pending = self._writer.pending_paths()
         try:
-            templates.append(Template.load(path))
-        except (ValueError, KeyError):
-            continue
-    return templates
+            entries = os.scandir(self.directory)
+        except FileNotFoundError:
+            entries = None
+        if entries is not None:
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith(".json"):
+                        continue
+                    template_id = name[: -len(".json")]
+                    if template_id in self._builtins:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    seen.add(template_id)
+                    if pending and Path(entry.path) in pending:
+                        continue
+                    signature = (st.st_mtime_ns, st.st_size)
+                    if self._snapshot.get(template_id) != signature:
+                        self._load(template_id, Path(entry.path), signature)
+        for template_id in self._snapshot.keys() - seen:
+            self._forget(template_id)
+
+    def list_templates(self) -> list[Template]:
+        self.refresh()
+        if self._sorted is None:
+            # Same order as sorting the file names, builtins included.
+            combined = {**self._index, **self._builtins}
+            self._sorted = [
+                combined[template_id]
+                for template_id in sorted(combined, key=lambda i: f"{i}.json")
+            ]
+        return list(self._sorted)
+
+    def get_template(self, template_id: str) -> Template | None:
+        if template_id in self._builtins:
+            return self._builtins[template_id]
+        path = self._path(template_id)
+        if self._writer.is_pending(path):
+            return self._index.get(template_id)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._forget(template_id)
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        if self._snapshot.get(template_id) != signature:
+            self._load(template_id, path, signature)
+        return self._index.get(template_id)
+
+    def save_template(self, template: Template) -> Template:
+        # The file is re-read once after the write lands (its signature
+        # changes); until then the in-memory copy is authoritative.
+        self._writer.write(self._path(template.id), template.to_json())
+        self._snapshot.pop(template.id, None)
+        self._index[template.id] = template
+        self._sorted = None
+        return template
+
+    def delete_template(self, template_id: str) -> bool:
+        path = self._path(template_id)
+        existed = template_id in self._index or path.exists()
+        self._forget(template_id)
+        self._writer.delete(path)
+        return existed
+
+    def search_templates(self, query: str, limit: int = 50) -> list[Template]:
+        """Case-insensitive match of every word against name and prompt fields."""
+        terms = query.lower().split()
+        if not terms:
+            return []
+        results = []
+        for template in self.list_templates():
+            haystack = "\n".join(getattr(template, f) for f in SEARCH_FIELDS).lower()
+            if all(term in haystack for term in terms):
+                results.append(template)
+                if len(results) == limit:
+                    break
+        return results
+
 
+_repository = None
 
+
+def _open_repository():
+    from prompt_enhancer.config import load_config
+
+    if load_config().template_store == "sqlite":
+        from prompt_enhancer.sqlite_store import SqliteTemplateStore
+
+        store = SqliteTemplateStore(TEMPLATES_DB)
+        store.import_directory_once(TEMPLATES_DIR)
+        return store
+    return TemplateRepository(TEMPLATES_DIR)
+
+
+def get_repository():
+    """Return the process-wide template store (JSON directory or SQLite)."""
+    global _repository
+    if _repository is None:
+        _repository = _open_repository()
+    return _repository
+
+
+def set_repository(repository) -> None:
+    """Replace the process-wide template store (``None`` reopens from config)."""
+    global _repository
+    _repository = repository
+
+
+@profiled_call
+def list_templates() -> list[Template]:
+    return get_repository().list_templates()
+
+
+@profiled_call
 def get_template(template_id: str) -> Template | None:
-    _ensure_builtins()
-    path = TEMPLATES_DIR / f"{template_id}.json"
-    if path.exists():
-        return Template.load(path)
-    return None
+    return get_repository().get_template(template_id)
 
 
+@profiled_call
 def save_template(template: Template) -> Template:
-    TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
-    path = TEMPLATES_DIR / f"{template.id}.json"
-    template.save(path)
-    return template
+    return get_repository().save_template(template)
 
 
+@profiled_call
 def delete_template(template_id: str) -> bool:
-    path = TEMPLATES_DIR / f"{template_id}.json"
-    if path.exists():
-        path.unlink()
-        return True
-    return False
+    return get_repository().delete_template(template_id)
+
+
+@profiled_call
+def search_templates(query: str, limit: int = 50) -> list[Template]:
+    return get_repository().search_templates(query, limit)
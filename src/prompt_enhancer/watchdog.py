@@ -0,0 +1,236 @@
+"""Event-loop lag watchdog: finds calls that block the UI.
+
+A heartbeat is scheduled on the event loop every ``interval`` seconds and
+the delay with which it actually runs is recorded in a histogram: on an idle
+loop it is ~0, and anything longer is time the loop spent on something else.
+A monitor thread notices when a heartbeat is more than ``stall_ms`` overdue
+and captures the event-loop thread's stack right then, while the blocking
+call is still on it. Stalls are grouped by the innermost frame inside
+``prompt_enhancer`` (the call site to fix) so repeat offenders add up.
+
+Opt-in with ``"watchdog": true`` in ``config.json`` or ``prompt-enhancer
+--watchdog``. Press F12 in the app for the live numbers; a JSON report is
+written to ``~/.prompt_enhancer/watchdog/`` on exit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from prompt_enhancer.persistence import atomic_write_text
+
+WATCHDOG_DIR = Path.home() / ".prompt_enhancer" / "watchdog"
+
+# Upper bounds of the lag histogram buckets, in ms.
+BUCKETS_MS = (1, 2, 4, 8, 16, 33, 50, 100, 250, 500, 1000, float("inf"))
+
+_PACKAGE_DIR = str(Path(__file__).resolve().parent)
+_STACK_LIMIT = 40
+
+
+@dataclass
+class Stall:
+    """Stalls whose captured stack blamed the same call site."""
+
+    culprit: str
+    stack: list[str]
+    count: int = 0
+    total_ms: float = 0.0
+    worst_ms: float = 0.0
+    last_seen: float = 0.0
+
+
+@dataclass
+class LagStats:
+    samples: int = 0
+    over_frame: int = 0
+    over_stall: int = 0
+    worst_ms: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * len(BUCKETS_MS))
+
+
+def _describe_stack(frame) -> tuple[str, list[str]]:
+    """Return (culprit, formatted stack) for the frame the loop is stuck in."""
+    summary = traceback.extract_stack(frame, limit=_STACK_LIMIT)
+    culprit = None
+    for entry in reversed(summary):
+        if entry.filename.startswith(_PACKAGE_DIR):
+            culprit = entry
+            break
+    if culprit is None and summary:
+        culprit = summary[-1]
+    label = (
+        f"{Path(culprit.filename).name}:{culprit.lineno} in {culprit.name}"
+        if culprit
+        else "unknown"
+    )
+    return label, [line.rstrip() for line in traceback.format_list(summary)]
+
+
+class LoopWatchdog:
+    """Measures lag of one event loop and captures stacks of long stalls."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        interval: float = 0.05,
+        frame_ms: float = 16.0,
+        stall_ms: float = 100.0,
+    ) -> None:
+        self.loop = loop
+        self.interval = interval
+        self.frame_ms = frame_ms
+        self.stall_ms = stall_ms
+        self.stats = LagStats()
+        self.stalls: dict[str, Stall] = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._loop_thread = threading.get_ident()
+        self._due = 0.0
+        # Culprit of the stall in progress, once its stack has been captured.
+        self._capture: str | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._stop = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    def start(self) -> LoopWatchdog:
+        """Start the heartbeat and monitor; call from the loop's thread."""
+        self._loop_thread = threading.get_ident()
+        self._schedule()
+        self._monitor = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._monitor.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self) -> None:
+        with self._lock:
+            self._due = time.monotonic() + self.interval
+        self._handle = self.loop.call_later(self.interval, self._beat)
+
+    def _beat(self) -> None:
+        lag_ms = max(0.0, (time.monotonic() - self._due) * 1000)
+        with self._lock:
+            stats = self.stats
+            stats.samples += 1
+            stats.worst_ms = max(stats.worst_ms, lag_ms)
+            if lag_ms > self.frame_ms:
+                stats.over_frame += 1
+            if lag_ms > self.stall_ms:
+                stats.over_stall += 1
+            for i, bound in enumerate(BUCKETS_MS):
+                if lag_ms <= bound:
+                    stats.histogram[i] += 1
+                    break
+            capture, self._capture = self._capture, None
+            if capture is not None:
+                stall = self.stalls[capture]
+                stall.total_ms += lag_ms
+                stall.worst_ms = max(stall.worst_ms, lag_ms)
+        if not self._stop.is_set():
+            self._schedule()
+
+    def _watch(self) -> None:
+        poll = min(self.interval, self.stall_ms / 1000) / 2
+        while not self._stop.wait(poll):
+            with self._lock:
+                overdue_ms = (time.monotonic() - self._due) * 1000
+                if overdue_ms <= self.stall_ms or self._capture is not None:
+                    continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            culprit, stack = _describe_stack(frame)
+            del frame
+            with self._lock:
+                stall = self.stalls.get(culprit)
+                if stall is None:
+                    stall = self.stalls[culprit] = Stall(culprit=culprit, stack=stack)
+                stall.count += 1
+                stall.last_seen = time.time()
+                self._capture = culprit
+
+    def snapshot(self) -> dict:
+        """Histogram, counters and stalls (worst first) as plain data."""
+        with self._lock:
+            stats = asdict(self.stats)
+            stalls = sorted(
+                (asdict(stall) for stall in self.stalls.values()),
+                key=lambda s: -s["total_ms"],
+            )
+        buckets = [
+            "inf" if bound == float("inf") else bound for bound in BUCKETS_MS
+        ]
+        return {
+            "started_at": self.started_at,
+            "interval_ms": self.interval * 1000,
+            "frame_ms": self.frame_ms,
+            "stall_ms": self.stall_ms,
+            **stats,
+            "histogram": dict(zip(map(str, buckets), stats["histogram"])),
+            "stalls": stalls,
+        }
+
+    def dump(self, directory: Path = WATCHDOG_DIR) -> Path | None:
+        """Write ``snapshot()`` as JSON; returns the path, or None if idle."""
+        snapshot = self.snapshot()
+        if not snapshot["samples"]:
+            return None
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        path = directory / f"{stamp}-{os.getpid()}.json"
+        atomic_write_text(path, json.dumps(snapshot, indent=2) + "\n")
+        return path
+
+
+_watchdog: LoopWatchdog | None = None
+_requested = False
+
+
+def request() -> None:
+    """Ask the app to start the watchdog even if the config doesn't."""
+    global _requested
+    _requested = True
+
+
+def requested() -> bool:
+    return _requested
+
+
+def start_watchdog(
+    loop: asyncio.AbstractEventLoop, stall_ms: float = 100.0
+) -> LoopWatchdog:
+    """Start the process-wide watchdog on ``loop`` (from the loop's thread)."""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = LoopWatchdog(loop, stall_ms=stall_ms).start()
+    return _watchdog
+
+
+def get_watchdog() -> LoopWatchdog | None:
+    return _watchdog
+
+
+def stop_watchdog() -> Path | None:
+    """Stop the watchdog and dump its report; returns the report path."""
+    global _watchdog
+    watchdog, _watchdog = _watchdog, None
+    if watchdog is None:
+        return None
+    watchdog.stop()
+    return watchdog.dump()
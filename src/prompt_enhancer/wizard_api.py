@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import re
+from typing import AsyncIterator
 
-import anthropic
-
+from prompt_enhancer.cache import content_key, get_cache
+from prompt_enhancer.clients import client_for_config
+from prompt_enhancer.metrics import RequestTimer, record
 from prompt_enhancer.models import AppConfig
+from prompt_enhancer.resilience import resilient_stream
+from prompt_enhancer.tag_stream import END, TagStreamParser
 
 TEMPLATE_FIELDS = [
     ("system_prompt", "System Prompt"),
@@ -49,12 +54,9 @@ def _build_system_prompt() -> str:
     )
 
 
-def _build_suggestion_prompt(
-    template_name: str,
-    field_key: str,
-    completed_fields: dict[str, str],
-    current_value: str | None = None,
-) -> str:
+def _describe_field(
+    template_name: str, field_key: str, completed_fields: dict[str, str]
+) -> list[str]:
     field_label = dict(TEMPLATE_FIELDS).get(field_key, field_key)
     description = FIELD_DESCRIPTIONS.get(field_key, "")
 
@@ -67,6 +69,16 @@ def _build_suggestion_prompt(
         label_map = dict(TEMPLATE_FIELDS)
         for k, v in completed_fields.items():
             parts.append(f"  {label_map.get(k, k)}: {v}")
+    return parts
+
+
+def _build_suggestion_prompt(
+    template_name: str,
+    field_key: str,
+    completed_fields: dict[str, str],
+    current_value: str | None = None,
+) -> str:
+    parts = _describe_field(template_name, field_key, completed_fields)
 
     if current_value:
         parts.append(f"\nThe user's current value for this field is:\n{current_value}")
@@ -92,25 +104,167 @@ def parse_suggestions(response_text: str) -> list[str]:
     return matches
 
 
-async def generate_suggestions(
+async def _stream_tagged(
+    config: AppConfig,
+    system: str,
+    user_message: str,
+    regenerate: bool,
+    kind: str = "suggestions",
+) -> AsyncIterator[str]:
+    """Yield each ``<suggestion>`` in the response as soon as it closes.
+
+    Results are cached on (model, system prompt, user message) when
+    ``config.suggestion_cache`` is on; cached results are yielded at once.
+    ``regenerate`` skips the lookup and replaces the cached entry. API calls
+    are recorded in the metrics under ``kind``.
+    """
+    cache = key = None
+    if config.suggestion_cache:
+        cache = get_cache("suggestions", config)
+        key = content_key(config.model, system, user_message)
+        if not regenerate:
+            cached = cache.get(key)
+            if cached:
+                for suggestion in cached:
+                    yield suggestion
+                return
+
+    client = client_for_config(config)
+    parser = TagStreamParser("suggestion")
+    timer = RequestTimer(kind, config.model)
+    try:
+        params = {
+            "model": config.model,
+            "max_tokens": config.max_tokens,
+            "system": system,
+            "messages": [{"role": "user", "content": user_message}],
+        }
+        async with resilient_stream(config, client, params, timer) as stream:
+            async for chunk in stream.text_stream:
+                timer.token()
+                for event in parser.feed(chunk):
+                    if event.kind == END:
+                        yield event.text
+            final = await stream.get_final_message()
+    except Exception as exc:
+        record(config, timer.finish(error=type(exc).__name__))
+        raise
+    record(config, timer.finish(final.usage))
+    parser.close()
+    if cache is not None and parser.completed:
+        cache.put(key, parser.completed)
+
+
+async def stream_suggestions(
     config: AppConfig,
     template_name: str,
     field_key: str,
     completed_fields: dict[str, str],
     current_value: str | None = None,
-) -> list[str]:
-    """Call Claude (non-streaming) to generate field suggestions."""
-    client = anthropic.AsyncAnthropic(api_key=config.api_key or None)
+    regenerate: bool = False,
+) -> AsyncIterator[str]:
+    """Yield each suggestion as soon as its closing ``</suggestion>`` arrives."""
     user_message = _build_suggestion_prompt(
         template_name, field_key, completed_fields, current_value
     )
-    text = ""
-    async with client.messages.stream(
-        model=config.model,
-        max_tokens=config.max_tokens,
-        system=_build_system_prompt(),
-        messages=[{"role": "user", "content": user_message}],
-    ) as stream:
-        async for chunk in stream.text_stream:
-            text += chunk
-    return parse_suggestions(text)
+    async for suggestion in _stream_tagged(
+        config, _build_system_prompt(), user_message, regenerate
+    ):
+        yield suggestion
+
+
+async def generate_suggestions(
+    config: AppConfig,
+    template_name: str,
+    field_key: str,
+    completed_fields: dict[str, str],
+    current_value: str | None = None,
+    regenerate: bool = False,
+) -> list[str]:
+    """Collect every suggestion from ``stream_suggestions``."""
+    return [
+        suggestion
+        async for suggestion in stream_suggestions(
+            config,
+            template_name,
+            field_key,
+            completed_fields,
+            current_value,
+            regenerate,
+        )
+    ]
+
+
+def _build_draft_system_prompt() -> str:
+    return (
+        "You are helping a user create a template for a prompt enhancement tool. "
+        "The user will tell you the template name, what it is for, and which "
+        "field to write. Write exactly one complete, ready-to-use draft of that "
+        "field.\n\n"
+        "Wrap the draft in <suggestion> XML tags like this:\n"
+        "<suggestion>\nYour draft here\n</suggestion>\n\n"
+        "The draft should be substantive (several sentences). Do not include any "
+        "other text outside the tags."
+    )
+
+
+def _build_draft_prompt(
+    template_name: str,
+    description: str,
+    field_key: str,
+    completed_fields: dict[str, str],
+) -> str:
+    parts = _describe_field(template_name, field_key, completed_fields)
+    if description:
+        parts.append(f"\nWhat the template is for: {description}")
+    parts.append("\nWrite one draft for this field.")
+    return "\n".join(parts)
+
+
+async def _draft_field(
+    config: AppConfig,
+    template_name: str,
+    description: str,
+    field_key: str,
+    completed_fields: dict[str, str],
+    regenerate: bool,
+) -> str:
+    user_message = _build_draft_prompt(
+        template_name, description, field_key, completed_fields
+    )
+    drafts = [
+        draft
+        async for draft in _stream_tagged(
+            config, _build_draft_system_prompt(), user_message, regenerate, "draft"
+        )
+    ]
+    return drafts[0] if drafts else ""
+
+
+async def draft_template(
+    config: AppConfig,
+    template_name: str,
+    description: str = "",
+    regenerate: bool = False,
+) -> dict[str, str]:
+    """Draft every template field from a name and a short description.
+
+    The system prompt is drafted first since the other fields build on it;
+    the remaining three are then drafted concurrently, so the whole template
+    takes two round trips instead of one per field.
+    """
+    first_key = TEMPLATE_FIELDS[0][0]
+    system_prompt = await _draft_field(
+        config, template_name, description, first_key, {}, regenerate
+    )
+    completed = {first_key: system_prompt}
+    rest = [key for key, _ in TEMPLATE_FIELDS[1:]]
+    drafts = await asyncio.gather(
+        *(
+            _draft_field(
+                config, template_name, description, key, completed, regenerate
+            )
+            for key in rest
+        )
+    )
+    return {first_key: system_prompt, **dict(zip(rest, drafts))}
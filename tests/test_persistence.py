@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+import threading
+
+from prompt_enhancer import persistence
+from prompt_enhancer.persistence import BackgroundWriter
+
+
+def test_umask_is_read_without_changing_it():
+    before = os.umask(0o022)
+    os.umask(before)
+    assert persistence._umask() == before
+    current = os.umask(0o022)
+    os.umask(current)
+    assert current == before
+
+
+def test_append_onto_a_queued_call_runs_both(tmp_path):
+    writer = BackgroundWriter()
+    path = tmp_path / "journal.jsonl"
+    # Hold the writer so both operations on ``path`` are queued together.
+    release = threading.Event()
+    writer.call(tmp_path / "hold", release.wait)
+    writer.call(path, lambda: path.write_text("first\n"))
+    writer.append(path, "second\n")
+    writer.append(path, "third\n")
+    release.set()
+    assert writer.flush(timeout=10)
+    assert not writer.errors
+    assert path.read_text() == "first\nsecond\nthird\n"
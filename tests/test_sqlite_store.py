@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+
+from prompt_enhancer.models import Template
+from prompt_enhancer.persistence import BackgroundWriter
+from prompt_enhancer.sqlite_store import SqliteTemplateStore
+
+BUILTIN = Template(
+    name="Code Review",
+    system_prompt="You review pull requests.",
+    id="builtin-review",
+    builtin=True,
+)
+
+
+def test_search_matches_the_same_before_and_after_flush(tmp_path):
+    writer = BackgroundWriter()
+    store = SqliteTemplateStore(tmp_path / "templates.db", [BUILTIN], writer)
+    # Hold the writer so the save below is still queued for the first search.
+    release = threading.Event()
+    writer.call(tmp_path / "hold", release.wait)
+    store.save_template(
+        Template(
+            name="Python Reviewer",
+            system_prompt="Reviews Python code for style and correctness.",
+            id="python-reviewer",
+        )
+    )
+    store.save_template(Template(name="Rust", system_prompt="pythonic reviews", id="rust"))
+
+    queries = ["python reviewer", "pyth rev", "review", "code", "ython", "reviewer python"]
+    before = {q: [t.id for t in store.search_templates(q)] for q in queries}
+    release.set()
+    assert writer.flush(timeout=10)
+    assert not writer.errors
+    after = {q: [t.id for t in store.search_templates(q)] for q in queries}
+
+    assert before == after
+    assert before["python reviewer"] == ["python-reviewer"]
+    assert before["ython"] == []
+    assert before["code"] == ["builtin-review", "python-reviewer"]